@@ -0,0 +1 @@
+# Puts the repository root on sys.path so tests import triggers/, utils/ and interface/ as the app does
@@ -1,9 +1,39 @@
 import os
+import threading
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                             QPushButton, QLineEdit, QComboBox, QMessageBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from utils.audio_ring_buffer import PREROLL_OPTIONS
+from utils.audio_stream_writer import available_formats
+from utils.triggered_recorder import TriggeredRecorder
+from utils.disk_retention import SIZE_LIMIT_OPTIONS, AGE_LIMIT_OPTIONS, COMPRESS_OPTIONS, disk_warning
+
+PATH_CHECK_DELAY_MS = 400  # Wait for typing to pause before touching the filesystem
+
+
+def check_path(path):
+    """Whether path can be used for recordings, without creating anything: (ok, message)"""
+    path = os.path.expanduser(path)
+    if not path:
+        return False, "No output path"
+    if os.path.exists(path):
+        if not os.path.isdir(path):
+            return False, "Not a folder"
+        if not os.access(path, os.W_OK):
+            return False, "Folder is not writable"
+        return True, ""
+    # Missing folders are created on commit; the nearest existing parent must be writable
+    parent = os.path.dirname(os.path.abspath(path))
+    while parent and not os.path.exists(parent):
+        parent = os.path.dirname(parent)
+    if not os.path.isdir(parent) or not os.access(parent, os.W_OK):
+        return False, "Folder can't be created here"
+    return True, "Folder will be created"
+
 
 class AudioRecordingSettings(QWidget):
+    path_checked = pyqtSignal(str, bool, str)  # path, ok, message (emitted from the checker thread)
+
     def __init__(self, parent=None, audio_record_manager=None):
         super().__init__(parent)
         self.audio_record_manager = audio_record_manager
@@ -11,6 +41,14 @@ class AudioRecordingSettings(QWidget):
         self.last_saved_settings = None
         self.recording = False
         self._current_category = None
+        self._reported_settings = None
+        self._loading = False  # Widget updates made by load_settings() don't count as edits
+        self.recorders = {}  # category -> armed TriggeredRecorder
+        self._path_timer = QTimer(self)
+        self._path_timer.setSingleShot(True)
+        self._path_timer.setInterval(PATH_CHECK_DELAY_MS)
+        self._path_timer.timeout.connect(self.start_path_check)
+        self.path_checked.connect(self.on_path_checked)
         self.initUI()
         
     def initUI(self):
@@ -21,7 +59,6 @@ class AudioRecordingSettings(QWidget):
         path_label = QLabel("Recording Output Path:")
         self.path_input = QLineEdit()
         self.path_input.setPlaceholderText("Enter path or browse...")
-        self.path_input.textChanged.connect(self.validate_path)
         
         browse_btn = QPushButton("Browse")
         browse_btn.clicked.connect(self.browse_path)
@@ -41,10 +78,55 @@ class AudioRecordingSettings(QWidget):
         duration_layout.addWidget(self.duration_combo)
         layout.addLayout(duration_layout)
         
+        # Pre-roll: audio kept from before the trigger matched
+        preroll_layout = QHBoxLayout()
+        preroll_label = QLabel("Include Audio Before Trigger:")
+        self.preroll_combo = QComboBox()
+        self.preroll_combo.addItems(list(PREROLL_OPTIONS))
+        
+        preroll_layout.addWidget(preroll_label)
+        preroll_layout.addWidget(self.preroll_combo)
+        layout.addLayout(preroll_layout)
+        
+        # Output format (compressed formats only listed when a codec is installed)
+        format_layout = QHBoxLayout()
+        format_label = QLabel("Output Format:")
+        self.format_combo = QComboBox()
+        self.format_combo.addItems([fmt.upper() for fmt in available_formats()])
+        
+        format_layout.addWidget(format_label)
+        format_layout.addWidget(self.format_combo)
+        layout.addLayout(format_layout)
+        
+        # Retention: only recordings made here are compressed/deleted to stay within these
+        retention_layout = QHBoxLayout()
+        size_label = QLabel("Storage Limit:")
+        self.max_size_combo = QComboBox()
+        self.max_size_combo.addItems(list(SIZE_LIMIT_OPTIONS))
+        age_label = QLabel("Keep Recordings:")
+        self.max_age_combo = QComboBox()
+        self.max_age_combo.addItems(list(AGE_LIMIT_OPTIONS))
+        compress_label = QLabel("Compress WAV:")
+        self.compress_combo = QComboBox()
+        self.compress_combo.addItems(list(COMPRESS_OPTIONS))
+        
+        retention_layout.addWidget(size_label)
+        retention_layout.addWidget(self.max_size_combo)
+        retention_layout.addWidget(age_label)
+        retention_layout.addWidget(self.max_age_combo)
+        retention_layout.addWidget(compress_label)
+        retention_layout.addWidget(self.compress_combo)
+        layout.addLayout(retention_layout)
+        
         # Add duration change handler
         self.duration_combo.currentTextChanged.connect(self.on_settings_changed)
-        # Add path change handler
-        self.path_input.textChanged.connect(self.on_settings_changed)
+        self.preroll_combo.currentTextChanged.connect(self.on_settings_changed)
+        self.format_combo.currentTextChanged.connect(self.on_settings_changed)
+        self.max_size_combo.currentTextChanged.connect(self.on_settings_changed)
+        self.max_age_combo.currentTextChanged.connect(self.on_settings_changed)
+        self.compress_combo.currentTextChanged.connect(self.on_settings_changed)
+        # Add path change handler (validation is debounced and runs off the GUI thread)
+        self.path_input.textChanged.connect(self.on_path_edited)
         
         # Recording status
         self.status_label = QLabel("Recording will start when category triggers match")
@@ -73,35 +155,43 @@ class AudioRecordingSettings(QWidget):
         self.setLayout(layout)
         self.recording = False
 
+    def on_path_edited(self, text):
+        """Restart the debounce timer; the path is checked once typing pauses"""
+        if not self.recording:
+            self.record_btn.setEnabled(False)
+        if not self._loading:
+            self.settings_changed = self.get_settings() != self.last_saved_settings
+        self._path_timer.start()
+
+    def start_path_check(self):
+        """Check the current path on a worker thread so slow (e.g. network) mounts can't stall the UI"""
+        path = self.path_input.text()
+        threading.Thread(target=lambda: self.path_checked.emit(path, *check_path(path)),
+                         name="PathCheck", daemon=True).start()
+
+    def on_path_checked(self, path, ok, message):
+        if path != self.path_input.text():
+            return  # Stale result; a newer check is pending
+        self.path_input.setStyleSheet("color: black;" if ok else "color: red;")
+        self.path_input.setToolTip(message)
+        self.record_btn.setEnabled(ok or self.recording)  # Stopping never depends on the path
+        self.on_settings_changed()
+
     def validate_path(self, path):
-        """Validate output path in real-time"""
-        result = False
+        """Validate the committed output path, creating the folder if needed"""
         path = os.path.expanduser(path)
-        try:
-            # Create directory if it doesn't exist
-            if not os.path.exists(path):
+        ok, message = check_path(path)
+        if ok and not os.path.exists(path):
+            try:
                 os.makedirs(path)
-            
-            # Check write permissions
-            if os.access(path, os.W_OK):
-                self.path_input.setStyleSheet("color: black;")
-                self.record_btn.setEnabled(True)
-                self.settings_changed = True  # Mark settings as changed
-                result = True
-            else:
-                self.path_input.setStyleSheet("color: red;")
-                self.record_btn.setEnabled(False)
-                result = False
-                
-        except Exception:
-            self.path_input.setStyleSheet("color: red;")
-            self.record_btn.setEnabled(False)
-            result = False
-            
-        if result:
+            except OSError as e:
+                ok, message = False, str(e)
+        self.path_input.setStyleSheet("color: black;" if ok else "color: red;")
+        self.path_input.setToolTip(message)
+        self.record_btn.setEnabled(ok)
+        if ok:
             print("\n📁 [AudioRecording] Valid output path:", path)
-            self.settings_changed = True  # Mark settings changed on valid path
-        return result
+        return ok
 
     def browse_path(self):
         """Open folder browser dialog"""
@@ -112,20 +202,41 @@ class AudioRecordingSettings(QWidget):
 
     def load_settings(self, settings: dict):
         """Load saved settings for a category"""
+        self._loading = True
+        try:
+            self._load_settings(settings or {})
+        finally:
+            self._loading = False
+        # Compare later edits against what the widgets show now, so keys missing from
+        # older saved settings and the deferred path check don't count as changes
+        self.last_saved_settings = self.get_settings()
+        self._reported_settings = self.get_settings()
+        self.settings_changed = False
+
+    def _load_settings(self, settings):
         if not settings:
             # Reset to defaults
             self.recording = False
             self.path_input.setText("")
             self.duration_combo.setCurrentText("1 minute")
+            self.preroll_combo.setCurrentText("Off")
+            self.format_combo.setCurrentIndex(0)
+            self.max_size_combo.setCurrentText("Unlimited")
+            self.max_age_combo.setCurrentText("Forever")
+            self.compress_combo.setCurrentText("Never")
             self.record_btn.setText("Start Recording")
             self.status_label.setText("Recording will start when category triggers match")
             self.status_label.setStyleSheet("color: gray;")
-            self.settings_changed = False
             return
 
         print("\n📂 [AudioRecording] Loading saved settings:", settings)
         self.path_input.setText(settings.get("output_path", ""))
         self.duration_combo.setCurrentText(settings.get("duration", "1 minute"))
+        self.preroll_combo.setCurrentText(settings.get("preroll", "Off"))
+        self.format_combo.setCurrentText(settings.get("format", "wav").upper())
+        self.max_size_combo.setCurrentText(settings.get("max_size", "Unlimited"))
+        self.max_age_combo.setCurrentText(settings.get("max_age", "Forever"))
+        self.compress_combo.setCurrentText(settings.get("compress", "Never"))
         
         # Restore recording state
         if settings.get("enabled", False):
@@ -133,26 +244,23 @@ class AudioRecordingSettings(QWidget):
             self.record_btn.setText("Stop Recording")
             self.status_label.setText(f"Recording will start when triggers match ({settings['duration']})")
             self.status_label.setStyleSheet("color: #4CAF50;")
-            self.validate_path(settings["output_path"])
         else:
             self.recording = False
             self.record_btn.setText("Start Recording")
             self.status_label.setText("Recording will start when category triggers match")
             self.status_label.setStyleSheet("color: gray;")
 
-        # Store last saved settings
-        self.last_saved_settings = settings.copy()
-        self.settings_changed = False
-
     def on_settings_changed(self, *args):
-        """Called when any setting changes"""
-        print("\n⚡ [AudioRecording] Settings changed")
-        self.settings_changed = True
-        # Get current values
+        """Called when any setting changes; logs only the keys that actually changed"""
+        if self._loading:
+            return
         current = self.get_settings()
-        if self.last_saved_settings != current:
-            print("  Previous:", self.last_saved_settings)
-            print("  Current:", current)
+        previous = self._reported_settings or {}
+        changed = {key: value for key, value in current.items() if previous.get(key) != value}
+        self._reported_settings = current
+        self.settings_changed = current != self.last_saved_settings
+        if changed:
+            print("\n⚡ [AudioRecording] Settings changed:", changed)
 
     def toggle_recording(self):
         """Toggle recording state"""
@@ -172,6 +280,9 @@ class AudioRecordingSettings(QWidget):
             print(f"\n🎙️ [AudioRecording] Starting recording configuration:")
             print(f"  Category: {self._current_category}")
             print(f"  Duration: {duration}")
+            print(f"  Pre-roll: {self.preroll_combo.currentText()}")
+            print(f"  Retention: {self.max_size_combo.currentText()}, {self.max_age_combo.currentText()}, "
+                  f"compress {self.compress_combo.currentText()}")
             print(f"  Path: {path}")
             
             # Update UI
@@ -192,6 +303,11 @@ class AudioRecordingSettings(QWidget):
                 self.audio_record_manager.set_output_path(path)
                 self.audio_record_manager.set_duration(duration)
                 print("  ✓ Settings saved to AudioRecordManager")
+            self.arm(self._current_category, self.get_settings())
+            warning = disk_warning(path)
+            if warning:
+                self.status_label.setText(warning)
+                self.status_label.setStyleSheet("color: #f44336;")
                 
         else:
             self.recording = False
@@ -207,18 +323,62 @@ class AudioRecordingSettings(QWidget):
             """)
             self.status_label.setText("Recording stopped")
             self.status_label.setStyleSheet("color: gray;")
+            self.disarm(self._current_category)
             
-        self.settings_changed = True
         self.on_settings_changed()
 
+    def arm(self, category, settings):
+        """Open the microphone for a category so its triggers can start recordings"""
+        self.disarm(category)
+        recorder = TriggeredRecorder(category, settings, parent=self)
+        recorder.recording_started.connect(lambda path: self.on_recording_started(category, path))
+        recorder.recording_finished.connect(lambda files: self.on_recording_finished(category, files))
+        recorder.recording_error.connect(self.on_recording_error)
+        if recorder.arm():
+            self.recorders[category] = recorder
+            # Apply the quotas now (on the retention worker) so old recordings are trimmed before new ones start
+            recorder.retention.enforce_later()
+
+    def disarm(self, category):
+        recorder = self.recorders.pop(category, None)
+        if recorder is not None:
+            recorder.disarm()
+
+    def trigger(self, category):
+        """Start (or extend) the armed category's recording; called when its triggers match"""
+        recorder = self.recorders.get(category)
+        if recorder is not None:
+            recorder.trigger()
+
+    def on_recording_started(self, category, path):
+        print(f"\n🔴 [AudioRecording] {category}: recording to {path}")
+        if category == self._current_category:
+            self.status_label.setText(f"Recording ({self.duration_combo.currentText()})")
+            self.status_label.setStyleSheet("color: #f44336;")
+
+    def on_recording_finished(self, category, files):
+        print(f"\n💾 [AudioRecording] {category}: recording saved to {', '.join(files)}")
+        if category == self._current_category and self.recording:
+            self.status_label.setText("Recording will start when triggers match")
+            self.status_label.setStyleSheet("color: #4CAF50;")
+
+    def on_recording_error(self, error_message):
+        print(f"\n✗ [AudioRecording] {error_message}")
+        self.status_label.setText(error_message)
+        self.status_label.setStyleSheet("color: #f44336;")
+
     def get_settings(self):
         """Get current audio recording settings"""
         settings = {
             "output_path": self.path_input.text(),
             "duration": self.duration_combo.currentText(),
+            "preroll": self.preroll_combo.currentText(),
+            "format": self.format_combo.currentText().lower(),
+            "max_size": self.max_size_combo.currentText(),
+            "max_age": self.max_age_combo.currentText(),
+            "compress": self.compress_combo.currentText(),
             "enabled": self.recording
         }
-        print("\n🎙️ [AudioRecording] Current settings:", settings)
         return settings
 
     def set_category(self, category_name: str):
@@ -236,6 +396,10 @@ class AudioRecordingSettings(QWidget):
                 print("  No saved settings found, using defaults")
                 self.load_settings({})
 
+        # A category saved as enabled is armed as soon as it is known
+        if self.recording and category_name not in self.recorders:
+            self.arm(category_name, self.get_settings())
+
     def store_settings(self):
         """Store current settings to manager"""
         if not self._current_category:
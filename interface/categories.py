@@ -633,10 +633,9 @@ class CategoriesTab(QWidget):
         if self.audio_settings:
             saved_audio = saved.get("audio_recording", {})
             print(f"  Loading audio settings: {saved_audio}")
-            self.audio_settings.load_settings(saved_audio)
-            
-            # Set the loaded settings to the audio record manager
+            # Set the loaded settings to the audio record manager, then point the widget at the category
             self.audio_record_manager.set_category_settings(category, saved_audio)
+            self.audio_settings.set_category(category)
 
         # Load sound settings
         sound_settings = saved.get("sound", {"muted": False, "volume": 50})
@@ -692,6 +691,7 @@ class CategoriesTab(QWidget):
         except (FileNotFoundError, json.JSONDecodeError):
             tags = {}
             print("tags.json not found or is invalid. No tags loaded.")
+        self.tags = tags  # What the checkboxes below were built from
 
         # Re-populate the triggers_layout with updated tags
         for trigger_type, tag_list in tags.items():
@@ -1060,6 +1060,15 @@ class CategoriesTab(QWidget):
     @pyqtSlot(str, list)
     def update_categories(self, trigger_type, tags):
         """Update UI with new trigger tags and save to file"""
+        # Update tags for this trigger type
+        new_tags = [
+            tag.to_dict() if hasattr(tag, 'to_dict') else tag
+            for tag in tags
+        ]
+        # Compare with what the UI was built from, not with the file: the sender may have saved it already
+        if self.tags.get(trigger_type) == new_tags:
+            return  # The UI already shows these tags; skip the rewrite and the rebuild
+
         try:
             # Load current tags
             with open(self.tags_data_file, "r") as f:
@@ -1067,19 +1076,26 @@ class CategoriesTab(QWidget):
         except (FileNotFoundError, json.JSONDecodeError):
             current_tags = {}
 
-        # Update tags for this trigger type
-        current_tags[trigger_type] = [
-            tag.to_dict() if hasattr(tag, 'to_dict') else tag
-            for tag in tags
-        ]
-
-        # Save updated tags
-        with open(self.tags_data_file, "w") as f:
-            json.dump(current_tags, f, indent=4)
+        # Save updated tags (unless the file already has them)
+        if current_tags.get(trigger_type) != new_tags:
+            current_tags[trigger_type] = new_tags
+            with open(self.tags_data_file, "w") as f:
+                json.dump(current_tags, f, indent=4)
 
         # Refresh UI
         self.refresh_categories_ui()
 
+    @pyqtSlot(str, list)
+    def on_tags_matched(self, trigger_type, matches):
+        """Start the recordings of armed categories that have one of the matched tags checked"""
+        if not self.audio_settings or not matches:
+            return
+        names = {name for name, _ in matches}
+        for category in list(self.audio_settings.recorders):
+            states = self.category_states.get(category, {})
+            if any(states.get(name) is True for name in names):
+                self.audio_settings.trigger(category)
+
     def on_mute_changed(self, state):
         """Update UI state and apply mute setting"""
         self.volume_slider.setEnabled(not state)
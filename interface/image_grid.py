@@ -0,0 +1,268 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtCore import (Qt, QSize, QRect, QEvent, QAbstractListModel, QModelIndex,
+                          pyqtSignal)
+from PyQt5.QtGui import QPixmap, QPixmapCache, QImageReader, QColor, QPen, QCursor
+
+THUMB_SIZE = 150
+TILE_SIZE = QSize(170, 205)
+
+# Foreground/background colours for the per-image status line
+STATUS_STYLES = {
+    'success': ("#28a745", "#f0fff0"),
+    'error': ("#dc3545", "#fff3f3"),
+    'normal': ("#666666", "#f8f9fa"),
+}
+
+PathRole = Qt.UserRole
+StatusRole = Qt.UserRole + 1
+StyleRole = Qt.UserRole + 2
+
+
+def load_thumbnail(image_path):
+    """Return a cached thumbnail, decoding the image at thumbnail size on first use"""
+    key = f"thumb:{image_path}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None and not pixmap.isNull():
+        return pixmap
+
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid():
+        # Let the decoder downscale instead of loading the full image
+        reader.setScaledSize(size.scaled(THUMB_SIZE, THUMB_SIZE, Qt.KeepAspectRatio))
+    image = reader.read()
+    pixmap = QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+    if not pixmap.isNull():
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+class ImageGridModel(QAbstractListModel):
+    """Flat list of image paths with a status message per image
+
+    Rows are looked up through a path -> row dict. A removal only marks
+    the rows after it as stale; they are renumbered in one pass on the
+    next lookup that needs them, so removals and bursts of status updates
+    never scan the list per call.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = []
+        self._status = {}  # path -> (message, style)
+        self._rows = {}  # path -> row; entries at or after _stale_from may be out of date
+        self._stale_from = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._paths):
+            return None
+        path = self._paths[index.row()]
+        if role == PathRole:
+            return path
+        if role == Qt.ToolTipRole:
+            return path
+        if role == Qt.DecorationRole:
+            return load_thumbnail(path)
+        if role == StatusRole:
+            return self._status.get(path, ("", 'normal'))[0]
+        if role == StyleRole:
+            return self._status.get(path, ("", 'normal'))[1]
+        return None
+
+    def paths(self):
+        return list(self._paths)
+
+    def contains(self, path):
+        return path in self._status
+
+    def row(self, path):
+        """Row of path, or -1 if it is not in the model"""
+        row = self._rows.get(path)
+        if row is None:
+            return -1
+        if row >= self._stale_from:
+            for i in range(self._stale_from, len(self._paths)):
+                self._rows[self._paths[i]] = i
+            self._stale_from = len(self._paths)
+            row = self._rows[path]
+        return row
+
+    def add_paths(self, paths):
+        """Append new images in a single insert"""
+        new_paths = [p for p in dict.fromkeys(paths) if p not in self._status]
+        if not new_paths:
+            return
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+        self._paths.extend(new_paths)
+        for row, path in enumerate(new_paths, first):
+            self._status[path] = ("", 'normal')
+            self._rows[path] = row
+        if self._stale_from == first:
+            self._stale_from = len(self._paths)
+        self.endInsertRows()
+
+    def remove_path(self, path):
+        """Remove a single image; returns False if it is not in the model"""
+        if path not in self._status:
+            return False
+        row = self.row(path)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._paths[row]
+        del self._status[path]
+        del self._rows[path]
+        self._stale_from = min(self._stale_from, row)
+        self.endRemoveRows()
+        QPixmapCache.remove(f"thumb:{path}")
+        return True
+
+    def set_status(self, path, message, style='normal'):
+        if path not in self._status:
+            return False
+        self._status[path] = (message, style)
+        index = self.index(self.row(path))
+        self.dataChanged.emit(index, index, [StatusRole, StyleRole])
+        return True
+
+    def clear(self):
+        self.beginResetModel()
+        for path in self._paths:
+            QPixmapCache.remove(f"thumb:{path}")
+        self._paths = []
+        self._status = {}
+        self._rows = {}
+        self._stale_from = 0
+        self.endResetModel()
+
+
+class ImageTileDelegate(QStyledItemDelegate):
+    """Paints an image tile (remove button, thumbnail, status) without child widgets"""
+    remove_requested = pyqtSignal(str)
+
+    BUTTON_SIZE = 20
+    STATUS_HEIGHT = 30
+
+    def __init__(self, parent=None, removable=True):
+        super().__init__(parent)
+        self.removable = removable
+
+    def sizeHint(self, option, index):
+        return TILE_SIZE
+
+    def _button_rect(self, rect):
+        return QRect(rect.right() - self.BUTTON_SIZE - 2, rect.top() + 2,
+                     self.BUTTON_SIZE, self.BUTTON_SIZE)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect.adjusted(2, 2, -2, -2)
+
+        # Raised white panel
+        painter.fillRect(rect, QColor("white"))
+        painter.setPen(QPen(QColor("#c8c8c8"), 2))
+        painter.drawRect(rect)
+
+        if self.removable:
+            button = self._button_rect(rect)
+            if (option.state & QStyle.State_MouseOver and option.widget is not None
+                    and button.contains(option.widget.viewport().mapFromGlobal(QCursor.pos()))):
+                painter.setBrush(QColor("#ffeeee"))
+                painter.setPen(Qt.NoPen)
+                painter.drawEllipse(button)
+            font = painter.font()
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(QColor("red"))
+            painter.drawText(button, Qt.AlignCenter, "×")
+
+        # Thumbnail, centered in the area between the button and status line
+        top = rect.top() + self.BUTTON_SIZE + 4
+        image_area = QRect(rect.left(), top, rect.width(),
+                           rect.bottom() - self.STATUS_HEIGHT - top)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            target = QRect(0, 0, pixmap.width(), pixmap.height())
+            target.moveCenter(image_area.center())
+            painter.drawPixmap(target, pixmap)
+
+        message = index.data(StatusRole)
+        if message:
+            color, background = STATUS_STYLES.get(index.data(StyleRole), STATUS_STYLES['normal'])
+            status_rect = QRect(rect.left() + 2, rect.bottom() - self.STATUS_HEIGHT,
+                                rect.width() - 4, self.STATUS_HEIGHT - 2)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(background))
+            painter.drawRoundedRect(status_rect, 3, 3)
+            font = painter.font()
+            font.setBold(False)
+            font.setPixelSize(11)
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(status_rect, Qt.AlignCenter | Qt.TextWordWrap, message)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (self.removable and event.type() == QEvent.MouseButtonRelease
+                and event.button() == Qt.LeftButton
+                and self._button_rect(option.rect.adjusted(2, 2, -2, -2)).contains(event.pos())):
+            self.remove_requested.emit(index.data(PathRole))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class ImageGridWidget(QListView):
+    image_removed = pyqtSignal(int)  # Remaining image count after a removal
+    image_path_removed = pyqtSignal(str)
+
+    def __init__(self, parent=None, removable=True):
+        super().__init__(parent)
+        self.parent_widget = parent
+        self.image_model = ImageGridModel(self)
+        self.setModel(self.image_model)
+
+        self.delegate = ImageTileDelegate(self, removable=removable)
+        self.delegate.remove_requested.connect(self.remove_image)
+        self.setItemDelegate(self.delegate)
+
+        # Icon mode with uniform tiles: Qt lays out and paints only the visible rows
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setGridSize(TILE_SIZE + QSize(6, 6))
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+
+    def add_image(self, image_path):
+        self.image_model.add_paths([image_path])
+
+    def add_images(self, image_paths):
+        self.image_model.add_paths(image_paths)
+
+    def remove_image(self, image_path):
+        """Remove an image tile"""
+        if self.image_model.remove_path(image_path):
+            self.image_path_removed.emit(image_path)
+            self.image_removed.emit(self.image_model.rowCount())
+
+    def update_status(self, image_path, message, style='normal'):
+        """Update the status line under an image; returns False if it was removed"""
+        return self.image_model.set_status(image_path, message, style)
+
+    def image_paths(self):
+        return self.image_model.paths()
+
+    def has_image(self, image_path):
+        return self.image_model.contains(image_path)
+
+    def image_count(self):
+        return self.image_model.rowCount()
+
+    def clear(self):
+        self.image_model.clear()
@@ -0,0 +1,90 @@
+import time
+from PyQt5.QtWidgets import QListWidget, QListWidgetItem
+from PyQt5.QtCore import Qt
+
+KeyRole = Qt.UserRole
+SIGNAL_UPDATE_INTERVAL = 5.0  # Seconds between signal-strength refreshes of one entry
+SIGNAL_JUMP = 15  # A change this large (in %) is shown immediately
+
+
+def network_key(network):
+    """Stable identity of a scanned network: its BSSID when known, else its SSID"""
+    return network.get('bssid') or network.get('ssid', '')
+
+
+def network_label(network):
+    return f"{network['ssid']} ({network['signal']}%)"
+
+
+class NetworkListWidget(QListWidget):
+    """Scan result list that applies each scan as a diff against the current entries
+
+    Entries are keyed by network_key(), so a new scan only inserts new
+    networks, removes vanished ones and refreshes signal strengths -
+    existing items (and therefore the user's selection) are left alone.
+    Signal changes are rate-limited per entry to keep the list from
+    flickering while scanning.
+    """
+
+    def __init__(self, parent=None, key=network_key, label=network_label,
+                 update_interval=SIGNAL_UPDATE_INTERVAL):
+        super().__init__(parent)
+        self.key = key
+        self.label = label
+        self.update_interval = update_interval
+        self._items = {}  # key -> QListWidgetItem
+        self._shown = {}  # key -> (signal shown, time it was shown)
+        self._placeholder = None
+
+    def update_networks(self, networks, now=None):
+        now = time.monotonic() if now is None else now
+        latest = {}
+        for network in networks:
+            key = self.key(network)
+            # Several BSSIDs can share an SSID when keyed by name; keep the strongest
+            if key not in latest or network.get('signal', 0) > latest[key].get('signal', 0):
+                latest[key] = network
+
+        self.setUpdatesEnabled(False)
+        try:
+            for key in [k for k in self._items if k not in latest]:
+                self.takeItem(self.row(self._items.pop(key)))
+                self._shown.pop(key, None)
+
+            for key, network in latest.items():
+                signal = network.get('signal', 0)
+                item = self._items.get(key)
+                if item is None:
+                    item = QListWidgetItem(self.label(network))
+                    item.setData(KeyRole, key)
+                    self.addItem(item)
+                    self._items[key] = item
+                    self._shown[key] = (signal, now)
+                    continue
+                shown, shown_at = self._shown[key]
+                if signal != shown and (now - shown_at >= self.update_interval
+                                        or abs(signal - shown) >= SIGNAL_JUMP):
+                    item.setText(self.label(network))
+                    self._shown[key] = (signal, now)
+
+            self._set_placeholder(not self._items)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _set_placeholder(self, show):
+        if show and self._placeholder is None:
+            self._placeholder = QListWidgetItem("No networks found.")
+            self._placeholder.setFlags(Qt.NoItemFlags)
+            self.addItem(self._placeholder)
+        elif not show and self._placeholder is not None:
+            self.takeItem(self.row(self._placeholder))
+            self._placeholder = None
+
+    def selected_keys(self):
+        return [item.data(KeyRole) for item in self.selectedItems()]
+
+    def clear(self):
+        super().clear()
+        self._items.clear()
+        self._shown.clear()
+        self._placeholder = None
@@ -2,201 +2,40 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox,
                            QLabel, QGroupBox, QPushButton, QLineEdit, QListWidget, QListWidgetItem,
                            QInputDialog, QMessageBox, QDialog, QFormLayout,
                            QProgressBar, QSpinBox, QFileDialog, QTextBrowser,
-                           QScrollArea, QWidget, QGridLayout, QFrame, 
-                           QToolButton, QSizePolicy, QApplication)  # Added QApplication
-from PyQt5.QtCore import Qt, QSize, pyqtSignal  # Added pyqtSignal
-from PyQt5.QtGui import QPixmap, QImage, QIcon  # Added QIcon
+                           QSizePolicy)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal  # Added pyqtSignal
+from PyQt5.QtGui import QIcon  # Added QIcon
 import os  # Add this import
 import re
 import requests
 from triggers.wifi import WiFiScanner, WiFiTag
 from triggers.location import LocationFetcher, LocationTag
 from triggers.bluetooth import BluetoothScanner, BluetoothTag
-from triggers.camera import ImageProcessor, CameraTag, get_image_guidelines
-from triggers.mic import AudioRecorder, AudioProcessor, MicTag
+from triggers.camera import CameraTag, get_image_guidelines
+from triggers.camera_pool import ParallelImageProcessor
+from triggers.feature_cache import get_feature_cache
+from triggers.mic import AudioRecorder, MicTag
+from triggers.audio_take import TakeCollector, take_from_recorder
+from triggers.audio_analysis import BufferAudioProcessor
+from triggers.voice_activity import VoiceActivityDetector
+from triggers.audio_meter import AudioLevelMeter
+from triggers.audio_fingerprint import FingerprintIndex
+from triggers.mic_features import MicFeatureCache
+from triggers.sensor_hub import get_sensor_hub, ThreadSensor, PolledSensor
+from triggers.wifi_backends import NetworkManagerBackend
+from triggers.bluez_discovery import BlueZDiscovery, bluez_available
+from triggers.radio_index import radio_index, wifi_identifier, bluetooth_identifier
+from triggers.observation_store import KEEPALIVE_INTERVAL, ObservationStore
+from triggers.geofence_index import GeofenceIndex
+from triggers.geocode_cache import get_geocode_cache
 from triggers.keyboard import KeyboardTag
-import numpy as np  # Add this import
-import scipy.io.wavfile as wav  # Add this import
-import sounddevice as sd  # Add this import
 import json  # Add this import
+import hashlib
+import time
 from settings.monitor import BackgroundMonitor
-
-class ImagePreviewWidget(QFrame):
-    def __init__(self, image_path, grid_widget):
-        super().__init__()
-        self.image_path = image_path
-        self.grid_widget = grid_widget  # Store reference to grid widget
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(2)
-        
-        # Remove button
-        remove_btn = QToolButton(self)
-        remove_btn.setText("×")
-        remove_btn.setStyleSheet("""
-            QToolButton {
-                color: red;
-                font-weight: bold;
-                border: none;
-                background: white;
-                border-radius: 10px;
-            }
-            QToolButton:hover {
-                background: #ffeeee;
-            }
-        """)
-        remove_btn.clicked.connect(self.remove_image)
-        
-        # Image preview
-        image_label = QLabel()
-        pixmap = QPixmap(image_path)
-        scaled_pixmap = pixmap.scaled(
-            QSize(150, 150),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        image_label.setPixmap(scaled_pixmap)
-        image_label.setAlignment(Qt.AlignCenter)
-        
-        # Status label
-        self.status_label = QLabel()
-        self.status_label.setWordWrap(True)
-        self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setStyleSheet("""
-            QLabel {
-                padding: 2px;
-                border-radius: 3px;
-                font-size: 11px;
-            }
-        """)
-        
-        layout.addWidget(remove_btn, alignment=Qt.AlignRight)
-        layout.addWidget(image_label)
-        layout.addWidget(self.status_label)
-        
-        self.setFrameStyle(QFrame.Panel | QFrame.Raised)
-        self.setLineWidth(2)
-        self.setStyleSheet("background-color: white;")
-
-    def remove_image(self):
-        # Call remove_image on the grid widget instead of parent
-        self.grid_widget.remove_image(self.image_path)
-
-    def update_status(self, message, style='normal'):
-        styles = {
-            'success': """
-                color: #28a745;
-                background-color: #f0fff0;
-            """,
-            'error': """
-                color: #dc3545;
-                background-color: #fff3f3;
-            """,
-            'normal': """
-                color: #666666;
-                background-color: #f8f9fa;
-            """
-        }
-        self.status_label.setText(message)
-        self.status_label.setStyleSheet(f"""
-            QLabel {{
-                padding: 2px;
-                border-radius: 3px;
-                font-size: 11px;
-                {styles.get(style, styles['normal'])}
-            }}
-        """)
-
-    def disconnect(self):
-        """Disconnect all signals before deletion"""
-        try:
-            self.findChild(QToolButton).clicked.disconnect()
-        except:
-            pass
-
-    def remove_image(self):
-        """Safely trigger image removal"""
-        try:
-            if hasattr(self, 'grid_widget') and self.grid_widget:
-                self.grid_widget.remove_image(self.image_path)
-        except Exception as e:
-            print(f"Error in remove_image: {str(e)}")
-
-class ImageGridWidget(QScrollArea):
-    image_removed = pyqtSignal(int)  # New signal for image count updates
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.parent_widget = parent  # Store reference to parent widget
-        self.main_widget = QWidget()
-        self.grid_layout = QGridLayout(self.main_widget)
-        self.setWidget(self.main_widget)
-        self.setWidgetResizable(True)
-        self.image_widgets = {}
-        
-    def add_image(self, image_path):
-        row = len(self.image_widgets) // 3
-        col = len(self.image_widgets) % 3
-        preview = ImagePreviewWidget(image_path, self)  # Pass self as grid_widget
-        self.grid_layout.addWidget(preview, row, col)
-        self.image_widgets[image_path] = preview
-        
-    def remove_image(self, image_path):
-        """Safely remove an image widget"""
-        try:
-            if image_path in self.image_widgets:
-                widget = self.image_widgets[image_path]
-                # Disconnect any signals/slots first
-                widget.disconnect()
-                # Remove from layout
-                self.grid_layout.removeWidget(widget)
-                # Schedule widget for deletion
-                widget.setParent(None)
-                widget.deleteLater()
-                # Remove from our tracking dict
-                self.image_widgets.pop(image_path)
-                # Emit count update
-                self.image_removed.emit(len(self.image_widgets))
-                # Schedule grid rearrangement
-                QApplication.processEvents()
-                self.rearrange_grid()
-        except Exception as e:
-            print(f"Error safely removing image: {str(e)}")
-    
-    def rearrange_grid(self):
-        """Safely rearrange the grid"""
-        try:
-            # Store current widgets
-            current_widgets = [(path, widget) for path, widget in self.image_widgets.items()]
-            
-            # Clear all items from grid
-            while self.grid_layout.count():
-                item = self.grid_layout.takeAt(0)
-                if item and item.widget():
-                    item.widget().hide()
-            
-            # Re-add widgets to their new positions
-            self.image_widgets.clear()
-            for idx, (path, widget) in enumerate(current_widgets):
-                row, col = divmod(idx, 3)
-                self.grid_layout.addWidget(widget, row, col)
-                widget.show()
-                self.image_widgets[path] = widget
-            
-        except Exception as e:
-            print(f"Error rearranging grid: {str(e)}")
-
-    def clear(self):
-        """Safely clear all widgets"""
-        try:
-            for widget in self.image_widgets.values():
-                widget.disconnect()
-                widget.setParent(None)
-                widget.deleteLater()
-            self.image_widgets.clear()
-            QApplication.processEvents()
-        except Exception as e:
-            print(f"Error clearing grid: {str(e)}")
+from utils.audio_player import AudioPlayer
+from interface.image_grid import ImageGridWidget
+from interface.network_list import NetworkListWidget
 
 class TagDialog(QDialog):
     def __init__(self, tag_name="", selected_items=None, tag_data=None):
@@ -212,52 +51,72 @@ class TagDialog(QDialog):
         
         # Add image preview for camera tags
         if tag_data and isinstance(tag_data, CameraTag):
-            preview_scroll = QScrollArea()
-            preview_widget = QWidget()
-            preview_layout = QGridLayout(preview_widget)
-            
-            for i, image_path in enumerate(tag_data.image_paths):
-                if os.path.exists(image_path):
-                    img_label = QLabel()
-                    pixmap = QPixmap(image_path)
-                    scaled_pixmap = pixmap.scaled(
-                        QSize(150, 150),
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    img_label.setPixmap(scaled_pixmap)
-                    row, col = i // 3, i % 3
-                    preview_layout.addWidget(img_label, row, col)
-            
-            preview_scroll.setWidget(preview_widget)
-            preview_scroll.setWidgetResizable(True)
-            preview_scroll.setMinimumHeight(200)
+            preview_grid = ImageGridWidget(removable=False)
+            preview_grid.add_images([p for p in tag_data.image_paths if os.path.exists(p)])
+            preview_grid.setMinimumHeight(200)
             layout.addWidget(QLabel("Saved Images:"))
-            layout.addWidget(preview_scroll)
+            layout.addWidget(preview_grid)
         
         self.setLayout(layout)
         self.setMinimumWidth(500)
 
 class TriggersTab(QWidget):
-    tag_changed = pyqtSignal(str, list)  # Signal: trigger type, list of tags
+    tag_changed = pyqtSignal(str, list)  # Signal: trigger type, list of tags (only when they change)
+    scan_results_updated = pyqtSignal(str, list)  # Signal: trigger type, latest scan results
+    tags_matched = pyqtSignal(str, list)  # Signal: trigger type, [(tag name, fraction seen)]
 
     def __init__(self):
         super().__init__()
         self.tags = {}  # Dictionary to store tags for each trigger type
         self.wifi_scanner = WiFiScanner()
         self.location_fetcher = LocationFetcher()
+        # Shared with the background monitor; repeated lookups of nearby points stay offline
+        self.geocode_cache = get_geocode_cache(os.path.join(os.path.dirname(__file__), "geocode_cache.db"))
+        self._geocode_query = None  # (lat, lon) typed by the user while its lookup is in flight
         self.location_fetcher.location_found.connect(self.on_location_found)
         self.location_fetcher.error_occurred.connect(self.on_location_error)
-        self.bluetooth_scanner = BluetoothScanner()
-        self.bluetooth_scanner.devices_found.connect(self.update_bluetooth_list)
+        # Prefer event-driven discovery from BlueZ signals over the polling scanner
+        self.bluetooth_scanner = BlueZDiscovery() if bluez_available() else BluetoothScanner()
         self.bluetooth_scanner.status_update.connect(self.update_bluetooth_status)
+        # The hub owns the radios so the UI and the background monitor share one scan
+        self.sensor_hub = get_sensor_hub()
+        if NetworkManagerBackend.available():
+            # Read NetworkManager's scan list over D-Bus instead of spawning a tool per scan
+            self.sensor_hub.add_sensor("Wifi", PolledSensor(NetworkManagerBackend().scan))
+        else:
+            self.sensor_hub.add_sensor("Wifi", ThreadSensor(self.wifi_scanner, self.wifi_scanner.wifi_list_updated))
+        self.sensor_hub.add_sensor("Bluetooth", ThreadSensor(self.bluetooth_scanner, self.bluetooth_scanner.devices_found))
+        self.sensor_hub.results_updated.connect(self.on_sensor_results)
+        if hasattr(self.bluetooth_scanner, 'proximity_changed'):
+            # Bluetooth tags then mean "device is nearby" rather than "device was seen"
+            self.bluetooth_scanner.proximity_changed.connect(self.on_bluetooth_proximity)
         self.current_trigger = None  # Track current trigger
         self.current_scanner = None  # Track current active scanner
         self._scanner_active = False
         self.network_list = None  # Initialize network_list to None
         self.bluetooth_list = None  # Initialize bluetooth_list to None
         self.tags_data_file = os.path.join(os.path.dirname(__file__), "tags.json")
+        self.camera_features_file = os.path.join(os.path.dirname(__file__), "camera_features.npz")
+        self.mic_fingerprints = FingerprintIndex(os.path.join(os.path.dirname(__file__), "mic_fingerprints.npz"))
+        self.mic_features = MicFeatureCache(os.path.join(os.path.dirname(__file__), "mic_features"))
+        self.voice_activity = VoiceActivityDetector()  # Shared by take analysis and live matching
         self.load_tags_from_file()  # Load stored tags at startup
+        self.radio_indexes = {t: radio_index(t) for t in ("Wifi", "Bluetooth")}
+        # Scan history, so tags can later be recognised from the networks usually around them
+        self.observations = ObservationStore(os.path.join(os.path.dirname(__file__), "observations.db"))
+        # The hub drops unchanged results, so confirm every so often that scanning radios are still on
+        self._observation_timer = QTimer(self)
+        self._observation_timer.setInterval(KEEPALIVE_INTERVAL * 1000)
+        self._observation_timer.timeout.connect(self.keep_observations)
+        self._observation_timer.start()
+        self.geofences = GeofenceIndex()
+        self.geofences.sync_tags(self.tags.get("Location", []))
+        for trigger_type, index in self.radio_indexes.items():
+            index.sync_tags(self.tags.get(trigger_type, []))
+        self.tag_versions = {}  # trigger type -> number of emitted changes
+        self._tag_hashes = {t: self._tags_hash(t) for t in self.tags}
+        self.mic_fingerprints.sync_tags(self.tags.get("Mic", []))
+        self.mic_features.sync_tags(self.tags.get("Mic", []))
         self.initUI()
         self.background_monitor = BackgroundMonitor()
         self.background_monitor.start_monitoring()
@@ -305,13 +164,23 @@ class TriggersTab(QWidget):
     def cleanup_scanners(self):
         """Stop any active scanners before switching interfaces"""
         self._scanner_active = False
-        if self.wifi_scanner and self.wifi_scanner.isRunning():
-            self.wifi_scanner.stop()
-            self.wifi_scanner.wait()  # Wait for thread to finish
-        if self.bluetooth_scanner and self.bluetooth_scanner.isRunning():
-            self.bluetooth_scanner.stop()
-            self.bluetooth_scanner.wait()  # Wait for thread to finish
+        self.sensor_hub.release_all(self)  # Scanners stop once no other consumer holds them
         self.current_scanner = None
+        self.end_observations()
+
+    def end_observations(self):
+        """Stop counting time for the last results of radios that are no longer scanning"""
+        if not hasattr(self, 'observations'):
+            return
+        for sensor in ("Wifi", "Bluetooth"):
+            if not self.sensor_hub.is_held(sensor):
+                self.observations.end(sensor)
+
+    def keep_observations(self):
+        """Keep counting time for the unchanged results of radios that are still scanning"""
+        for sensor in ("Wifi", "Bluetooth"):
+            if self.sensor_hub.is_held(sensor):
+                self.observations.keepalive(sensor)
 
     def update_trigger_interface(self, trigger_type):
         # First, stop any running scanners and wait for them to finish
@@ -446,6 +315,7 @@ class TriggersTab(QWidget):
     def fetch_current_location(self):
         self.status_label.setText("Fetching current location...")
         self.status_label.setStyleSheet("color: #666;")
+        self._geocode_query = None
         self.location_fetcher.get_current_location()
 
     def verify_google_link(self):
@@ -495,6 +365,11 @@ class TriggersTab(QWidget):
             lon = float(self.lon_input.text())
             
             if -90 <= lat <= 90 and -180 <= lon <= 180:
+                cached = self.geocode_cache.get(lat, lon)
+                if cached is not None:
+                    self.on_location_found(dict(cached, latitude=lat, longitude=lon), from_cache=True)
+                    return
+                self._geocode_query = (lat, lon)
                 self.location_fetcher.get_location_from_address(f"{lat}, {lon}")
                 self.status_label.setText("Verifying coordinates...")
                 self.status_label.setStyleSheet("color: #666;")
@@ -505,8 +380,14 @@ class TriggersTab(QWidget):
             self.status_label.setText("Invalid coordinate format")
             self.status_label.setStyleSheet("color: red;")
 
-    def on_location_found(self, location):
+    def on_location_found(self, location, from_cache=False):
         self.current_location = location
+        if not from_cache and location.get('address'):
+            # Store under the coordinates that were looked up, not the place they resolved to,
+            # so verifying the same coordinates again is a cache hit
+            lat, lon = self._geocode_query or (location['latitude'], location['longitude'])
+            self.geocode_cache.put(lat, lon, location)
+        self._geocode_query = None
         self.location_label.setText(
             f"📍 Location: {location['address']}\n"
             f"📌 Coordinates: {location['latitude']:.6f}, {location['longitude']:.6f}\n"
@@ -514,6 +395,8 @@ class TriggersTab(QWidget):
         )
         self.status_label.setText("Location verified ✓")
         self.status_label.setStyleSheet("color: green;")
+        inside = self.geofences.match(location['latitude'], location['longitude'])
+        self.tags_matched.emit("Location", [(name, 1.0) for name, _ in inside])
 
     def on_location_error(self, error_message):
         QMessageBox.warning(self, "Location Error", error_message)
@@ -528,16 +411,13 @@ class TriggersTab(QWidget):
         scan_btn = QPushButton("Start Scanning")
         scan_btn.clicked.connect(self.toggle_wifi_scan)
         
-        self.network_list = QListWidget()  # Assign network_list
+        self.network_list = NetworkListWidget(key=wifi_identifier)  # Keyed by BSSID/SSID; scans are applied as diffs
         self.network_list.setSelectionMode(QListWidget.MultiSelection)
         
         main_layout.addWidget(scan_btn)
         main_layout.addWidget(self.network_list)
         
         self.trigger_layout.addLayout(main_layout)
-        
-        # Connect WiFi scanner signals after network_list is initialized
-        self.wifi_scanner.wifi_list_updated.connect(self.update_wifi_list)
 
     def setup_bluetooth_interface(self):
         layout = QVBoxLayout()
@@ -612,6 +492,7 @@ class TriggersTab(QWidget):
         self.image_grid = ImageGridWidget(self)
         self.image_grid.setMinimumHeight(400)
         self.image_grid.image_removed.connect(self.update_image_count)
+        self.image_grid.image_path_removed.connect(self.on_image_removed)
         upload_layout.addWidget(self.image_grid, 1)
         
         # Processing indicator and status
@@ -637,12 +518,14 @@ class TriggersTab(QWidget):
         layout.addLayout(main_content, 1)
         self.trigger_layout.addLayout(layout)
         
-        # Initialize image processor
-        self.image_processor = ImageProcessor()
-        self.image_processor.processing_complete.connect(self.on_processing_complete)
-        self.image_processor.processing_error.connect(self.on_processing_error)
-        self.image_processor.status_update.connect(self.update_camera_status)
-        self.image_processor.image_processed.connect(self.on_image_processed)
+        # Initialize image processor once; its worker pool is reused across visits
+        if not hasattr(self, 'image_processor'):
+            self.image_processor = ParallelImageProcessor(
+                feature_cache=get_feature_cache(self.camera_features_file))
+            self.image_processor.processing_complete.connect(self.on_processing_complete)
+            self.image_processor.processing_error.connect(self.on_processing_error)
+            self.image_processor.status_update.connect(self.update_camera_status)
+            self.image_processor.image_processed.connect(self.on_image_processed)
         
         self.current_images = []
 
@@ -664,8 +547,7 @@ class TriggersTab(QWidget):
             
             # Update image grid
             self.image_grid.clear()
-            for path in file_names:
-                self.image_grid.add_image(path)
+            self.image_grid.add_images(file_names)
             
             # Update counter
             count = len(file_names)
@@ -675,6 +557,8 @@ class TriggersTab(QWidget):
             self.image_processor.process_images(file_names)
 
     def on_image_removed(self, image_path):
+        # Stop processing an image the user no longer wants
+        self.image_processor.cancel(image_path)
         try:
             if image_path in self.current_images:
                 self.current_images.remove(image_path)
@@ -711,6 +595,26 @@ class TriggersTab(QWidget):
         self.duration_label = QLabel("Duration: 0 seconds")
         layout.addWidget(self.duration_label)
         
+        # Voice activity thresholds: silence below these is skipped before analysis/matching
+        vad_group = QGroupBox("Voice Detection")
+        vad_layout = QFormLayout()
+        self.vad_energy_input = QSpinBox()
+        self.vad_energy_input.setRange(-80, -10)
+        self.vad_energy_input.setSuffix(" dB")
+        self.vad_energy_input.setValue(int(self.voice_activity.energy_threshold_db))
+        self.vad_energy_input.setToolTip("Frames quieter than this are treated as silence")
+        self.vad_zcr_input = QSpinBox()
+        self.vad_zcr_input.setRange(1, 100)
+        self.vad_zcr_input.setSuffix(" %")
+        self.vad_zcr_input.setValue(int(self.voice_activity.zcr_threshold * 100))
+        self.vad_zcr_input.setToolTip("Zero-crossing rate that marks quiet unvoiced sounds (s, f) as active")
+        self.vad_energy_input.valueChanged.connect(self.update_vad_thresholds)
+        self.vad_zcr_input.valueChanged.connect(self.update_vad_thresholds)
+        vad_layout.addRow("Energy threshold:", self.vad_energy_input)
+        vad_layout.addRow("Zero-crossing threshold:", self.vad_zcr_input)
+        vad_group.setLayout(vad_layout)
+        layout.addWidget(vad_group)
+        
         # Guidelines
         guidelines_text = QTextBrowser()
         guidelines_text.setHtml("""
@@ -728,18 +632,31 @@ class TriggersTab(QWidget):
         
         # Initialize audio recorder and processor
         self.audio_recorder = AudioRecorder()
-        self.audio_processor = AudioProcessor()
+        self.audio_processor = BufferAudioProcessor(vad=self.voice_activity)
         
         self.audio_recorder.recording_complete.connect(self.on_recording_complete)
         self.audio_recorder.recording_error.connect(self.on_recording_error)
         self.audio_recorder.status_update.connect(self.update_mic_status)
-        self.audio_recorder.audio_signal.connect(self.update_audio_level)
-        
-        self.audio_processor.processing_complete.connect(self.on_processing_complete)
-        self.audio_processor.processing_error.connect(self.on_processing_error)
+        # Levels are reduced on the recorder's thread; only (rms, peak) reach the GUI
+        self.audio_meter = AudioLevelMeter(max_rate=30)
+        self.audio_recorder.audio_signal.connect(self.audio_meter.process, Qt.DirectConnection)
+        # The take is collected from the same chunks, so it never goes through a temporary file
+        self.take_collector = TakeCollector()
+        self.audio_recorder.audio_signal.connect(self.take_collector.process, Qt.DirectConnection)
+        self.audio_meter.level_changed.connect(self.update_audio_level)
+        
+        self.audio_processor.processing_complete.connect(self.on_audio_analyzed)
+        self.audio_processor.processing_error.connect(self.update_mic_status)
         self.audio_processor.status_update.connect(self.update_mic_status)
         
-        # Store current audio path
+        # Preview playback runs on the audio device's callback thread
+        self.audio_player = AudioPlayer(self)
+        self.audio_player.playback_started.connect(self.on_playback_started)
+        self.audio_player.playback_finished.connect(self.on_playback_finished)
+        self.audio_player.playback_error.connect(self.on_playback_error)
+        
+        # Last recorded take (in memory) and where it was saved, once it is
+        self.current_take = None
         self.current_audio_path = None
 
     def toggle_recording(self):
@@ -747,21 +664,38 @@ class TriggersTab(QWidget):
             self.audio_recorder.stop_recording()
             self.record_btn.setText("Record Audio")
         else:
+            self.audio_meter.reset()
+            self.take_collector.reset()
             self.audio_recorder.start()
             self.record_btn.setText("Stop Recording")
 
     def on_recording_complete(self, message):
         self.update_mic_status(message)
         self.record_btn.setText("Record Audio")
+        # Hand the collected samples, at the rate they were recorded at, straight to the processor
+        self.current_audio_path = None
+        try:
+            self.current_take = take_from_recorder(self.audio_recorder, self.take_collector)
+        except Exception as e:
+            self.current_take = None
+            self.update_mic_status(f"Error reading recorded audio: {e}")
+            self.mic_status.setStyleSheet("color: red;")
+            return
+        if self.current_take is None:
+            self.update_mic_status("No audio was recorded")
+            return
         self.test_audio_btn.setEnabled(True)
-        # Save the recorded audio temporarily
-        temp_audio_path = os.path.join('data', 'temp_audio.wav')
-        self.current_audio_path = self.audio_recorder.save_audio(temp_audio_path)
-        # Analyze the recorded audio
-        self.audio_processor.analyze_audio(self.current_audio_path)
+        self.audio_processor.analyze_take(self.current_take)
         # Update duration label
-        duration = self.audio_recorder.duration
-        self.duration_label.setText(f"Duration: {duration:.2f} seconds")
+        self.duration_label.setText(f"Duration: {self.current_take.duration:.2f} seconds")
+
+    def on_audio_analyzed(self, result):
+        self.update_mic_status(result['message'])
+        self.mic_status.setStyleSheet("color: green;" if result['valid'] else "color: red;")
+
+    def update_vad_thresholds(self, *args):
+        self.voice_activity.energy_threshold_db = float(self.vad_energy_input.value())
+        self.voice_activity.zcr_threshold = self.vad_zcr_input.value() / 100.0
 
     def on_recording_error(self, error_message):
         self.update_mic_status(error_message)
@@ -770,56 +704,82 @@ class TriggersTab(QWidget):
     def update_mic_status(self, message):
         self.mic_status.setText(message)
 
-    def update_audio_level(self, signal):
-        level = int(np.abs(signal).mean() * 100)
-        self.audio_level.setValue(level)
+    def update_audio_level(self, rms, peak):
+        self.audio_level.setValue(int(rms * 100))
 
     def test_audio(self):
-        if self.current_audio_path:
-            self.play_audio(self.current_audio_path)
+        if self.audio_player.is_playing():
+            self.audio_player.stop()
+        elif self.current_take is not None:
+            self.audio_player.play_buffer(self.current_take.samples, self.current_take.sample_rate)
 
     def play_audio(self, audio_path):
-        try:
-            # Play the audio using sounddevice
-            data, fs = wav.read(audio_path)
-            print(f"Audio data type before playing: {data.dtype}")  # Debugging statement
-            if isinstance(data, np.ndarray):
-                data = data.astype(np.int16)  # Convert to supported datatype
-            sd.play(data, fs)
-            sd.wait()
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to play audio: {str(e)}")
+        """Start non-blocking playback; the button turns into a stop button meanwhile"""
+        self.audio_player.play(audio_path)
+
+    def on_playback_started(self):
+        self.test_audio_btn.setText("Stop Audio")
+
+    def on_playback_finished(self):
+        self.test_audio_btn.setText("Test Audio")
+
+    def on_playback_error(self, error_message):
+        self.test_audio_btn.setText("Test Audio")
+        QMessageBox.warning(self, "Error", error_message)
 
     def toggle_wifi_scan(self):
-        if self.wifi_scanner.isRunning():
+        if self.sensor_hub.is_held("Wifi", self):
             self._scanner_active = False
-            self.wifi_scanner.stop()
+            self.sensor_hub.release("Wifi", self)
+            self.end_observations()
             self.sender().setText("Start Scanning")
             self.current_scanner = None
         else:
             self.cleanup_scanners()  # Stop other scanners first
             self._scanner_active = True
-            self.wifi_scanner.start()
+            self.sensor_hub.acquire("Wifi", self)
             self.sender().setText("Stop Scanning")
             self.current_scanner = self.wifi_scanner
 
     def toggle_bluetooth_scan(self):
         sender = self.sender()
-        if self.bluetooth_scanner.isRunning():
+        if self.sensor_hub.is_held("Bluetooth", self):
             self._scanner_active = False
-            self.bluetooth_scanner.stop()
+            self.sensor_hub.release("Bluetooth", self)
+            self.end_observations()
             sender.setText("Start Scanning")
             self.current_scanner = None
         else:
             self.cleanup_scanners()  # Stop other scanners first
             self._scanner_active = True
-            self.bluetooth_scanner.start()
+            self.sensor_hub.acquire("Bluetooth", self)
             sender.setText("Stop Scanning")
             self.current_scanner = self.bluetooth_scanner
 
+    def on_sensor_results(self, sensor, results):
+        """Route hub results to the list for the interface being shown"""
+        if sensor == "Wifi":
+            self.observations.record(sensor, [(wifi_identifier(n), n.get('signal')) for n in results])
+        elif sensor == "Bluetooth":
+            rssi = getattr(self.bluetooth_scanner, 'table', None)
+            self.observations.record(sensor, [(bluetooth_identifier(d), rssi.rssi(d[0]) if rssi else None)
+                                              for d in results])
+        if sensor in self.radio_indexes and not (sensor == "Bluetooth" and hasattr(self.bluetooth_scanner, 'proximity')):
+            self.tags_matched.emit(sensor, self.radio_indexes[sensor].match(results))
+        if not self._scanner_active or sensor != self.current_trigger:
+            return
+        if sensor == "Wifi":
+            self.update_wifi_list(results)
+        elif sensor == "Bluetooth":
+            self.update_bluetooth_list(results)
+
     def closeEvent(self, event):
         """Handle cleanup when widget is closed"""
         self.cleanup_scanners()
+        if hasattr(self, 'audio_player'):
+            self.audio_player.stop()
+        if hasattr(self, 'image_processor'):
+            self.image_processor.shutdown()
         super().closeEvent(event)
 
     def update_wifi_list(self, networks):
@@ -837,11 +797,7 @@ class TriggersTab(QWidget):
                 print(f"Current trigger is {self.current_trigger}, not Wifi.")
                 return
                 
-            self.network_list.clear()
-            if not networks:
-                self.network_list.addItem("No networks found.")
-            for network in networks:
-                self.network_list.addItem(f"{network['ssid']} ({network['signal']}%)")
+            self.network_list.update_networks(networks)
         except RuntimeError:
             # print("RuntimeError encountered in update_wifi_list.")  # Debugging statement
             self.cleanup_scanners()
@@ -849,13 +805,35 @@ class TriggersTab(QWidget):
             # print(f"Error updating wifi list: {str(e)}")  # Debugging statement
             self.cleanup_scanners()
 
+    def on_bluetooth_proximity(self, address, near):
+        nearby = [(a, "") for a in self.bluetooth_scanner.proximity.near_devices()]
+        self.tags_matched.emit("Bluetooth", self.radio_indexes["Bluetooth"].match(nearby))
+
     def update_bluetooth_list(self, devices):
         # Update the Bluetooth devices list in the UI
+        if self.bluetooth_list is None:
+            return
         self.bluetooth_list.clear()
         for addr, name in devices:
             item = QListWidgetItem(f"{name} ({addr})")
+            item.setData(Qt.UserRole, bluetooth_identifier((addr, name)))
             self.bluetooth_list.addItem(item)
-        self.tag_changed.emit("Bluetooth", self.tags.get("Bluetooth", []))
+        # Scan results don't change any tag; don't make listeners rewrite tags.json
+        self.scan_results_updated.emit("Bluetooth", list(devices))
+
+    def _tags_hash(self, trigger_type):
+        tags = [t.to_dict() if hasattr(t, 'to_dict') else t for t in self.tags.get(trigger_type, [])]
+        return hashlib.sha1(json.dumps(tags, sort_keys=True, default=str).encode()).hexdigest()
+
+    def emit_tag_changed(self, trigger_type):
+        """Emit tag_changed if this trigger type's tags differ from the last emission"""
+        digest = self._tags_hash(trigger_type)
+        if self._tag_hashes.get(trigger_type) == digest:
+            return False
+        self._tag_hashes[trigger_type] = digest
+        self.tag_versions[trigger_type] = self.tag_versions.get(trigger_type, 0) + 1
+        self.tag_changed.emit(trigger_type, [t.to_dict() for t in self.tags.get(trigger_type, [])])
+        return True
 
     def update_bluetooth_status(self, message):
         self.bt_status_label.setText(message)
@@ -875,23 +853,26 @@ class TriggersTab(QWidget):
                 QMessageBox.warning(self, "Location Error", "No location selected.")
                 return
         elif trigger_type == "Wifi":
-            selected_networks = [item.text() for item in self.network_list.selectedItems()]
+            selected_networks = self.network_list.selected_keys()  # Normalized BSSID/SSID identifiers
             wifi_tag = WiFiTag(tag_name, selected_networks)
             self.tags.setdefault(trigger_type, []).append(wifi_tag)
         elif trigger_type == "Bluetooth":
-            selected_devices = [item.text() for item in self.bluetooth_list.selectedItems()]
+            selected_devices = [item.data(Qt.UserRole) for item in self.bluetooth_list.selectedItems()]
             bluetooth_tag = BluetoothTag(tag_name, selected_devices)
             self.tags.setdefault(trigger_type, []).append(bluetooth_tag)
         elif trigger_type == "Camera":
-            if hasattr(self, 'image_grid') and self.image_grid.image_widgets:
-                selected_images = list(self.image_grid.image_widgets.keys())
+            if hasattr(self, 'image_grid') and self.image_grid.image_count():
+                selected_images = self.image_grid.image_paths()
                 camera_tag = CameraTag(tag_name, selected_images)
                 self.tags.setdefault(trigger_type, []).append(camera_tag)
             else:
                 QMessageBox.warning(self, "Camera Error", "No images selected.")
                 return
         elif trigger_type == "Mic":
-            if hasattr(self, 'current_audio_path') and self.current_audio_path:
+            if getattr(self, 'current_take', None) is not None:
+                # Content-addressed, so re-saving the same take reuses its file
+                takes_dir = os.path.join(os.path.dirname(self.tags_data_file), "mic_recordings")
+                self.current_audio_path = self.current_take.save(takes_dir)
                 mic_tag = MicTag(tag_name, self.current_audio_path)
                 self.tags.setdefault(trigger_type, []).append(mic_tag)
             else:
@@ -903,7 +884,11 @@ class TriggersTab(QWidget):
             self.tags.setdefault(trigger_type, []).append(keyboard_tag)
         
         # Emit signal to update CategoriesTab
-        self.tag_changed.emit(trigger_type, [tag.to_dict() for tag in self.tags[trigger_type]])
+        self.emit_tag_changed(trigger_type)
+        # The user confirmed the tag from what was observed while scanning, so label that whole window;
+        # automatic matches never label, so mistakes can't reinforce
+        now = time.time()
+        self.observations.label(trigger_type, tag_name, self.observations.active_since() or now, now)
         
         # Save to tags.json
         self.save_tags_to_file()
@@ -938,7 +923,7 @@ class TriggersTab(QWidget):
             item.setText(new_name)
             # Save changes
             self.save_tags_to_file()
-            self.tag_changed.emit(trigger_type, [t.to_dict() for t in self.tags[trigger_type]])
+            self.emit_tag_changed(trigger_type)
             QMessageBox.information(self, "Tag Edited", f"Tag '{new_name}' edited successfully.")
 
     def delete_tag(self):
@@ -958,7 +943,7 @@ class TriggersTab(QWidget):
                 tag_list.remove(tag)
                 self.tags_list.takeItem(self.tags_list.row(item))
                 self.save_tags_to_file()
-                self.tag_changed.emit(trigger_type, [t.to_dict() for t in self.tags[trigger_type]])
+                self.emit_tag_changed(trigger_type)
                 QMessageBox.information(self, "Tag Deleted", f"Tag '{tag_name}' deleted successfully.")
 
     def current_trigger_type(self):
@@ -998,10 +983,8 @@ class TriggersTab(QWidget):
         """Handle individual image processing results"""
         if hasattr(self, 'image_grid'):
             image_path = result.get('path')
-            if image_path not in self.image_grid.image_widgets:
+            if not self.image_grid.update_status(image_path, result['message'], result.get('style', 'normal')):
                 return  # Image was removed before processing finished
-            widget = self.image_grid.image_widgets[image_path]
-            widget.update_status(result['message'], result.get('style', 'normal'))
         
         # Update progress bar
         if hasattr(self, 'processing_bar'):
@@ -1010,8 +993,6 @@ class TriggersTab(QWidget):
             if result['index'] == result['total']:
                 self.processing_bar.hide()
 
-        QApplication.processEvents()  # Process events to prevent UI freeze
-
     def update_camera_status(self, message):
         """Update camera processing status"""
         if hasattr(self, 'camera_status'):
@@ -1044,17 +1025,6 @@ class TriggersTab(QWidget):
                     }
                 """)
 
-    def play_audio(self, audio_path):
-        try:
-            # Play the audio using sounddevice
-            data, fs = wav.read(audio_path)
-            if isinstance(data, np.ndarray):
-                data = data.astype(np.int16)  # Convert to supported datatype
-            sd.play(data, fs)
-            sd.wait()
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to play audio: {str(e)}")
-
     def _get_bluetooth_icon(self, device_type):
         # Define a mapping from device types to icon paths
         icon_mapping = {
@@ -1109,12 +1079,17 @@ class TriggersTab(QWidget):
                     tags_data[trigger_type].append(tag)  # Assuming it's already a dict
         with open(self.tags_data_file, "w") as f:
             json.dump(tags_data, f, indent=4)
+        for trigger_type, index in self.radio_indexes.items():
+            index.sync_tags(self.tags.get(trigger_type, []))
+        self.geofences.sync_tags(self.tags.get("Location", []))
+        # Only new, changed or deleted MicTags touch the fingerprint index
+        self.mic_fingerprints.sync_tags(self.tags.get("Mic", []))
+        self.mic_features.sync_tags(self.tags.get("Mic", []))
 
     def remove_image(self, image_path):
         self.image_grid.remove_image(image_path)
         self.tags.pop(image_path, None)
         self.save_tags_to_file()
-        self.image_grid.rearrange_grid()
 
     def update_image_count(self, count):
         """Update the UI when images are removed"""
@@ -1125,9 +1100,6 @@ class TriggersTab(QWidget):
             self.camera_status.setText("")
             self.processing_bar.hide()
 
-    def rearrange_grid(self):
-        self.image_grid.rearrange_grid()
-
     def setup_keyboard_interface(self):
         layout = QVBoxLayout()
         layout.addLayout(self.create_standard_tag_input())
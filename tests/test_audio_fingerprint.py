@@ -0,0 +1,69 @@
+import numpy as np
+from triggers.audio_fingerprint import FingerprintIndex, RollingMatcher
+
+RATE = 16000
+
+
+def tone_clip(seed, tones=40, tone_seconds=0.3):
+    """Sequence of random pure tones with a little noise; distinct seeds give unrelated clips"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(tone_seconds * RATE)) / RATE
+    clip = np.concatenate([np.sin(2 * np.pi * f * t) for f in rng.uniform(200, 3500, tones)])
+    return (0.5 * clip + 0.02 * rng.standard_normal(len(clip))).astype(np.float32)
+
+
+class SilentVad:
+    def is_active(self, samples, sample_rate):
+        return False
+
+
+def feed(matcher, samples, chunk=1024):
+    for start in range(0, len(samples), chunk):
+        matcher.push(samples[start:start + chunk])
+
+
+def make_index():
+    index = FingerprintIndex()
+    index.add_tag("a", tone_clip(1), RATE)
+    index.add_tag("b", tone_clip(2), RATE)
+    return index
+
+
+def test_rolling_window_matches_the_recorded_tag():
+    matcher = RollingMatcher(make_index(), RATE)
+    feed(matcher, tone_clip(1)[RATE:6 * RATE])  # Starts mid-clip, so offsets must line up
+
+    matches = matcher.match()
+    assert matches and matches[0][0] == "a"
+    assert "b" not in [name for name, _ in matches]
+
+
+def test_unrelated_audio_does_not_match():
+    matcher = RollingMatcher(make_index(), RATE)
+    feed(matcher, tone_clip(3))
+    assert matcher.match() == []
+
+
+def test_silent_window_is_not_matched():
+    matcher = RollingMatcher(make_index(), RATE, vad=SilentVad())
+    feed(matcher, tone_clip(1))
+    assert matcher.match() == []
+
+
+def test_removed_tag_no_longer_matches():
+    index = make_index()
+    index.remove_tag("a")
+    matcher = RollingMatcher(index, RATE)
+    feed(matcher, tone_clip(1))
+    assert matcher.match() == []
+    assert "a" not in index
+
+
+def test_index_round_trips_through_file(tmp_path):
+    index_file = str(tmp_path / "fingerprints.npz")
+    index = FingerprintIndex(index_file)
+    index.add_tag("a", tone_clip(1), RATE)
+    index.save()
+
+    reloaded = FingerprintIndex(index_file)
+    assert reloaded.match(tone_clip(1)[:4 * RATE], RATE)[0][0] == "a"
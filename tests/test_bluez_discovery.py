@@ -0,0 +1,112 @@
+import pytest
+from PyQt5.QtCore import QCoreApplication
+from triggers.bluez_discovery import (ADAPTER_IFACE, DEVICE_IFACE, OBJECT_MANAGER, PROPERTIES, BlueZDiscovery,
+                                      DeviceTable, parse_interfaces_added, parse_interfaces_removed,
+                                      parse_properties_changed)
+
+PHONE = "/org/bluez/hci0/dev_AA_BB_CC_DD_EE_FF"
+WATCH = "/org/bluez/hci0/dev_11_22_33_44_55_66"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class FakeBus:
+    """Stands in for QtDBusBus: records calls and lets a test deliver signal payloads"""
+
+    def __init__(self, managed=None):
+        self.managed = managed or {}
+        self.handlers = {}
+        self.calls = []
+
+    def subscribe(self, interface, member, handler):
+        self.handlers[(interface, member)] = handler
+
+    def unsubscribe_all(self):
+        self.handlers = {}
+
+    def call(self, path, interface, method, *args):
+        self.calls.append((path, interface, method))
+        return []
+
+    def managed_objects(self):
+        return self.managed
+
+    def emit(self, interface, member, path, *args):
+        self.handlers[(interface, member)](path, list(args))
+
+
+def device(address, name=None, rssi=None):
+    props = {"Address": address}
+    if name is not None:
+        props["Name"] = name
+    if rssi is not None:
+        props["RSSI"] = rssi
+    return props
+
+
+def started(bus):
+    discovery = BlueZDiscovery(bus=bus)
+    published = []
+    discovery.devices_found.connect(published.append)
+    discovery.start()
+    return discovery, published
+
+
+def test_payload_parsing():
+    added = [PHONE, {DEVICE_IFACE: device("AA"), "org.bluez.MediaControl1": {}}]
+    assert parse_interfaces_added(added) == (PHONE, device("AA"))
+    assert parse_interfaces_added(["/org/bluez/hci0", {ADAPTER_IFACE: {}}]) is None
+    assert parse_interfaces_removed([PHONE, [DEVICE_IFACE]]) == PHONE
+    assert parse_interfaces_removed([PHONE, ["org.bluez.MediaControl1"]]) is None
+    assert parse_properties_changed(PHONE, [DEVICE_IFACE, {"RSSI": -60}, []]) == (PHONE, {"RSSI": -60})
+    assert parse_properties_changed(PHONE, [ADAPTER_IFACE, {"Discovering": True}, []]) is None
+
+
+def test_start_loads_managed_objects_and_starts_discovery():
+    bus = FakeBus({PHONE: {DEVICE_IFACE: device("AA", "Phone", -50)}, WATCH: {DEVICE_IFACE: device("11", "Watch")}})
+    discovery, published = started(bus)
+
+    assert published[-1] == [("AA", "Phone")]  # The watch has no RSSI yet, so it isn't present
+    assert ("/org/bluez/hci0", ADAPTER_IFACE, "StartDiscovery") in bus.calls
+    discovery.stop()
+    assert bus.handlers == {}
+    assert ("/org/bluez/hci0", ADAPTER_IFACE, "StopDiscovery") in bus.calls
+
+
+def test_signals_update_the_device_table():
+    bus = FakeBus()
+    discovery, published = started(bus)
+    rssi = []
+    discovery.device_rssi.connect(lambda address, value: rssi.append((address, value)))
+
+    bus.emit(OBJECT_MANAGER, "InterfacesAdded", "/", PHONE, {DEVICE_IFACE: device("AA", "Phone")})
+    assert published[-1] == []  # Known, but not advertising yet
+
+    bus.emit(PROPERTIES, "PropertiesChanged", PHONE, DEVICE_IFACE, {"RSSI": -55}, [])
+    bus.emit(OBJECT_MANAGER, "InterfacesAdded", "/", WATCH, {DEVICE_IFACE: device("11", "Watch", -70)})
+    assert published[-1] == [("AA", "Phone"), ("11", "Watch")]
+    count = len(published)
+
+    bus.emit(PROPERTIES, "PropertiesChanged", PHONE, DEVICE_IFACE, {"RSSI": -52}, [])
+    bus.emit(PROPERTIES, "PropertiesChanged", PHONE, ADAPTER_IFACE, {"Powered": True}, [])
+    assert len(published) == count  # RSSI updates alone don't re-publish the device set
+    assert rssi[-1] == ("AA", -52)
+    assert discovery.table.rssi("AA") == -52
+
+    bus.emit(OBJECT_MANAGER, "InterfacesRemoved", "/", PHONE, [DEVICE_IFACE])
+    assert published[-1] == [("11", "Watch")]
+    discovery.stop()
+
+
+def test_table_expires_silent_devices():
+    table = DeviceTable(expiry=10.0)
+    assert table.update(PHONE, device("AA", "Phone", -60), now=0.0)
+    assert not table.update(PHONE, {"RSSI": -61}, now=5.0)
+    assert table.expire(now=14.0) == []
+    assert table.expire(now=16.0) == ["AA"]
+    assert table.devices() == []
+    assert table.update(PHONE, {"RSSI": -58}, now=20.0)  # Comes back under the name it had
+    assert table.devices() == [("AA", "Phone")]
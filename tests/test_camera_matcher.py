@@ -0,0 +1,83 @@
+import numpy as np
+from triggers.camera_matcher import CameraTagMatcher
+from triggers.image_features import EMBEDDING_SIZE
+
+
+def unit(seed):
+    vector = np.random.default_rng(seed).standard_normal(EMBEDDING_SIZE).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeTag:
+    def __init__(self, name, image_paths):
+        self.name = name
+        self.image_paths = image_paths
+
+
+class FakeFeatureCache:
+    def __init__(self, embeddings):
+        self.embeddings = embeddings  # path -> embedding
+        self.requests = []
+
+    def embeddings_for(self, paths):
+        self.requests.append(list(paths))
+        return np.vstack([self.embeddings[p] for p in paths])
+
+
+def test_best_reference_per_tag_decides_the_match():
+    matcher = CameraTagMatcher(default_threshold=0.9)
+    matcher.set_tag("kitchen", [unit(1), unit(2)])
+    matcher.set_tag("office", [unit(3)])
+
+    matches = matcher.match([unit(2), unit(3), unit(4)])
+
+    assert [name for name, _ in matches[0]] == ["kitchen"]
+    assert matches[0][0][1] > 0.99
+    assert [name for name, _ in matches[1]] == ["office"]
+    assert matches[2] == []  # Unrelated frame stays below every threshold
+
+
+def test_scores_match_brute_force_after_removal_and_replacement():
+    matcher = CameraTagMatcher()
+    references = {name: [unit(10 * i + j) for j in range(i + 1)] for i, name in enumerate("abcde")}
+    for name, rows in references.items():
+        matcher.set_tag(name, rows)
+    matcher.remove_tag("b")
+    references.pop("b")
+    references["d"] = [unit(99)]
+    matcher.set_tag("d", references["d"])
+
+    frames = np.vstack([unit(seed) for seed in (0, 21, 99, 7)])
+    scores, tags = matcher.scores(frames)
+
+    expected = np.array([[max(float(f @ r) for r in references[name]) for name in tags] for f in frames])
+    assert sorted(tags) == sorted(references)
+    np.testing.assert_allclose(scores, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_per_tag_threshold_and_top_k():
+    matcher = CameraTagMatcher(default_threshold=0.0)
+    frame = unit(5)
+    for i in range(5):
+        matcher.set_tag(f"t{i}", [frame + 0.1 * i * unit(50 + i)])
+    matcher.set_threshold("t0", 1.1)  # Unreachable, so t0 is never reported
+
+    matches = matcher.match([frame], top_k=3)[0]
+
+    assert len(matches) <= 3
+    assert "t0" not in [name for name, _ in matches]
+    assert [s for _, s in matches] == sorted((s for _, s in matches), reverse=True)
+
+
+def test_sync_tags_only_rebuilds_changed_tags():
+    cache = FakeFeatureCache({"a.jpg": unit(1), "b.jpg": unit(2), "c.jpg": unit(3)})
+    matcher = CameraTagMatcher()
+    matcher.sync_tags([FakeTag("one", ["a.jpg"]), FakeTag("two", ["b.jpg"])], cache)
+    cache.requests.clear()
+
+    matcher.sync_tags([FakeTag("one", ["a.jpg"]), FakeTag("two", ["c.jpg"])], cache)
+    assert cache.requests == [["c.jpg"]]
+
+    matcher.sync_tags([FakeTag("two", ["c.jpg"])], cache)
+    assert len(matcher) == 1
+    assert matcher.scores([unit(3)])[1] == ["two"]
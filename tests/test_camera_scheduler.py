@@ -0,0 +1,52 @@
+import numpy as np
+from triggers.camera_scheduler import AdaptiveCameraScheduler
+
+
+def make_scheduler():
+    return AdaptiveCameraScheduler(min_interval=0.5, max_interval=5.0, confidence_decay=0.05,
+                                   refresh_interval=1000.0, load_fn=lambda: 0.0)
+
+
+def test_static_scene_backs_off_after_confidence_drop():
+    scheduler = make_scheduler()
+    frame = np.full((64, 64, 3), 128, dtype=np.uint8)
+    now = 0.0
+    assert scheduler.should_match(frame, now)
+    scheduler.record_match(0.9, now)
+    scheduler.record_match(0.8, now)  # Confidence drops, then holds steady at the lower level
+
+    runs = 0
+    for _ in range(30):
+        now += scheduler.next_interval()
+        if scheduler.should_match(frame, now):
+            runs += 1
+            scheduler.record_match(0.8, now)
+
+    assert runs == 1  # The drop is checked once, not on every frame afterwards
+    assert scheduler.next_interval() == scheduler.max_interval
+
+
+def test_further_drop_escalates_again():
+    scheduler = make_scheduler()
+    frame = np.zeros((64, 64), dtype=np.uint8)
+    scheduler.should_match(frame, 0.0)
+    scheduler.record_match(0.9, 0.0)
+    scheduler.record_match(0.8, 1.0)
+    assert scheduler.should_match(frame, 2.0)
+    scheduler.record_match(0.8, 2.0)
+    assert not scheduler.should_match(frame, 3.0)
+    scheduler.record_match(0.7, 4.0)
+    assert scheduler.should_match(frame, 5.0)
+
+
+def test_scene_change_escalates_and_resets_interval():
+    scheduler = make_scheduler()
+    dark = np.zeros((64, 64), dtype=np.uint8)
+    scheduler.should_match(dark, 0.0)
+    scheduler.record_match(0.9, 0.0)
+    for i in range(1, 8):
+        assert not scheduler.should_match(dark, float(i))
+    assert scheduler.next_interval() > scheduler.min_interval
+
+    assert scheduler.should_match(np.full((64, 64), 255, dtype=np.uint8), 9.0)
+    assert scheduler.next_interval() == scheduler.min_interval
@@ -0,0 +1,55 @@
+import pytest
+from triggers.observation_store import HOUR, ObservationStore
+
+T0 = 1000 * HOUR  # On an hour boundary
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ObservationStore(str(tmp_path / "observations.db"), max_interval=300)
+    yield store
+    store.close(T0 + 10 * HOUR)
+
+
+def seconds_seen(store, identifier, hour=T0):
+    return store._conn.execute(
+        "SELECT SUM(r.seconds) FROM rollups r JOIN identifiers i ON i.id = r.ident "
+        "WHERE i.identifier = ? AND r.hour = ?", (identifier, hour)).fetchone()[0]
+
+
+def test_stable_set_counts_in_full_with_keepalives(store):
+    store.record("Wifi", [("home", -50)], now=T0)
+    for t in range(60, HOUR, 60):
+        store.keepalive("Wifi", now=T0 + t)
+    store.end("Wifi", now=T0 + HOUR)
+    assert seconds_seen(store, "home") == pytest.approx(HOUR)
+
+
+def test_gap_without_keepalive_is_capped(store):
+    store.record("Wifi", [("home", -50)], now=T0)
+    store.end("Wifi", now=T0 + 2000)  # e.g. the machine slept with the scanner held
+    assert seconds_seen(store, "home") == pytest.approx(300)
+
+
+def test_active_since_spans_the_whole_scanning_session(store):
+    assert store.active_since() is None
+    store.record("Wifi", [("home", -50)], now=T0 + 100)
+    store.record("Wifi", [("home", -50), ("cafe", -80)], now=T0 + 200)
+    store.record("Bluetooth", [("phone", -60)], now=T0 + 150)
+    assert store.active_since("Wifi") == T0 + 100
+    assert store.active_since() == T0 + 100
+    store.end("Wifi", now=T0 + 300)
+    assert store.active_since() == T0 + 150
+
+
+def test_labelled_window_finds_usual_networks(store):
+    store.record("Wifi", [("home", -50), ("neighbour", -85)], now=T0)
+    store.keepalive("Wifi", now=T0 + 240)
+    store.record("Wifi", [("home", -52)], now=T0 + 480)
+    store.label("Wifi", "Home", store.active_since("Wifi"), T0 + 600)
+    store.end("Wifi", now=T0 + 600)
+
+    usual = store.usually_seen("Wifi", "Home", "Wifi", min_fraction=0.5)
+    assert [identifier for identifier, _, _ in usual] == ["home", "neighbour"]
+    assert usual[0][1] == pytest.approx(1.0)
+    assert usual[1][1] == pytest.approx(0.8)
@@ -0,0 +1,30 @@
+from triggers.rssi_filter import ProximityFilter
+
+
+def test_nearby_state_has_hysteresis():
+    proximity = ProximityFilter(near_dbm=-70, far_dbm=-80, measurement_noise=1.0)
+    assert proximity.update("a", -60, 0.0) is True
+    assert proximity.update("a", -75, 1.0) is None  # Between the thresholds: still nearby
+    assert proximity.is_near("a")
+    for t in range(2, 10):
+        proximity.update("a", -95, float(t))
+    assert not proximity.is_near("a")
+
+
+def test_silent_devices_are_forgotten_and_slots_compacted():
+    proximity = ProximityFilter(lost_seconds=10.0, forget_seconds=60.0, capacity=2)
+    for i in range(5):
+        proximity.update(f"gone{i}", -60, 0.0)
+    proximity.update("stays", -60, 0.0)
+
+    assert sorted(proximity.expire(20.0)) == sorted([f"gone{i}" for i in range(5)] + ["stays"])
+    assert len(proximity) == 6  # Lost, but remembered for a while
+
+    assert proximity.update("stays", -60, 60.0) is True
+    assert proximity.expire(65.0) == []
+    assert len(proximity) == 1
+    assert proximity.smoothed("gone0") is None
+    # Its filter state survived compaction
+    assert proximity.is_near("stays")
+    assert proximity.smoothed("stays") == -60.0
+    assert proximity.update("stays", -61, 66.0) is None
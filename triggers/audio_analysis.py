@@ -0,0 +1,80 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+import numpy as np
+from triggers.audio_fingerprint import to_mono_float
+from triggers.voice_activity import VoiceActivityDetector
+
+MIN_DURATION = 1.0  # Seconds
+MIN_RMS = 0.01
+MAX_CLIPPED = 0.01  # Fraction of samples at full scale
+
+
+def analyze_samples(samples, sample_rate, vad=None):
+    """Quality checks for a recorded take; returns a result dict
+
+    Silence is cut out by the voice activity detector first, so levels and
+    later feature extraction only look at the active regions.
+    """
+    vad = vad or VoiceActivityDetector()
+    mono = to_mono_float(samples)
+    duration = len(mono) / sample_rate if sample_rate else 0.0
+    segments = vad.segments(mono, sample_rate)
+    active = np.concatenate([mono[s:e] for s, e in segments]) if segments else mono[:0]
+    active_duration = len(active) / sample_rate if sample_rate else 0.0
+    rms = float(np.sqrt(np.dot(active, active) / len(active))) if len(active) else 0.0
+    clipped = float(np.count_nonzero(np.abs(active) >= 0.999) / len(active)) if len(active) else 0.0
+
+    if duration < MIN_DURATION:
+        valid, message = False, f"Recording too short ({duration:.1f}s)"
+    elif not segments:
+        valid, message = False, "No voice or sound detected"
+    elif active_duration < MIN_DURATION:
+        valid, message = False, f"Too little sound detected ({active_duration:.1f}s)"
+    elif rms < MIN_RMS:
+        valid, message = False, "Recording is too quiet"
+    elif clipped > MAX_CLIPPED:
+        valid, message = False, "Recording is clipping; move away from the microphone"
+    else:
+        valid, message = True, f"✓ Audio analyzed ({active_duration:.1f}s of {duration:.1f}s active)"
+    return {
+        'valid': valid,
+        'message': message,
+        'duration': duration,
+        'active_duration': active_duration,
+        'segments': segments,
+        'rms': rms,
+        'clipped': clipped,
+        'total_processed': 1,
+    }
+
+
+class BufferAudioProcessor(QThread):
+    """Analyzes an in-memory AudioTake off the GUI thread
+
+    Same signals as AudioProcessor, but takes the recorded samples
+    directly instead of a path, so nothing is written to disk until the
+    take is saved as a tag.
+    """
+    processing_complete = pyqtSignal(dict)
+    processing_error = pyqtSignal(str)
+    status_update = pyqtSignal(str)
+
+    def __init__(self, vad=None):
+        super().__init__()
+        self.vad = vad or VoiceActivityDetector()
+        self._take = None
+
+    def analyze_take(self, take):
+        if self.isRunning():
+            self.wait()
+        self._take = take
+        self.start()
+
+    def run(self):
+        take = self._take
+        if take is None:
+            return
+        try:
+            self.status_update.emit("Analyzing audio...")
+            self.processing_complete.emit(analyze_samples(take.samples, take.sample_rate, self.vad))
+        except Exception as e:
+            self.processing_error.emit(f"Error analyzing audio: {str(e)}")
@@ -0,0 +1,257 @@
+from collections import defaultdict
+from math import gcd
+import os
+import threading
+import numpy as np
+from scipy.ndimage import maximum_filter
+from scipy.signal import resample_poly
+import scipy.io.wavfile as wav
+
+SAMPLE_RATE = 8000
+N_FFT = 512
+HOP = 128
+FAN_OUT = 5
+MAX_DT = 63  # Frames between paired peaks; fits the 6-bit dt field
+PEAK_NEIGHBORHOOD = (15, 11)  # Frequency bins x frames
+PEAKS_PER_BLOCK = 16  # Strongest peaks kept per ~1 second, so noise can't crowd out landmarks
+BLOCK_FRAMES = SAMPLE_RATE // HOP
+MIN_MATCHES = 5
+
+
+def to_mono_float(samples):
+    """Convert int/float, mono/multi-channel audio to mono float32 in -1.0 - 1.0"""
+    samples = np.asarray(samples)
+    if samples.dtype.kind in "iu":
+        samples = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max)
+    else:
+        samples = samples.astype(np.float32, copy=False)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    return samples
+
+
+def resample(samples, sample_rate, target_rate=SAMPLE_RATE):
+    """Polyphase resample of mono float audio"""
+    if sample_rate == target_rate:
+        return samples
+    divisor = gcd(int(sample_rate), int(target_rate))
+    return resample_poly(samples, target_rate // divisor, int(sample_rate) // divisor).astype(np.float32)
+
+
+def spectrogram(samples):
+    """Log-magnitude STFT, shape (frequency bins, frames)"""
+    if len(samples) < N_FFT:
+        return np.empty((N_FFT // 2 + 1, 0), dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, N_FFT)[::HOP]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(N_FFT).astype(np.float32), axis=1))
+    return np.log1p(spectrum.T * 100.0).astype(np.float32)
+
+
+def find_peaks(spec):
+    """Strongest local maxima per time block, sorted by time: (frames, bins)"""
+    if not spec.size:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+    local_max = maximum_filter(spec, size=PEAK_NEIGHBORHOOD, mode="constant") == spec
+    peaks = local_max & (spec > spec.mean())
+    freqs, times = np.nonzero(peaks)
+
+    # Rank peaks by magnitude within each block and keep the top PEAKS_PER_BLOCK
+    blocks = times // BLOCK_FRAMES
+    order = np.lexsort((-spec[freqs, times], blocks))
+    blocks = blocks[order]
+    first = np.searchsorted(blocks, blocks)
+    keep = order[np.arange(len(order)) - first < PEAKS_PER_BLOCK]
+
+    keep = keep[np.argsort(times[keep], kind="stable")]
+    return times[keep].astype(np.int32), freqs[keep].astype(np.int32)
+
+
+def fingerprint(samples, sample_rate):
+    """Landmark hashes of an audio clip: (hashes uint32, anchor frames int32)"""
+    samples = resample(to_mono_float(samples), sample_rate)
+    times, freqs = find_peaks(spectrogram(samples))
+    hashes, anchors = [], []
+    for k in range(1, FAN_OUT + 1):
+        if len(times) <= k:
+            break
+        dt = times[k:] - times[:-k]
+        valid = (dt > 0) & (dt <= MAX_DT)
+        f1, f2 = freqs[:-k][valid], freqs[k:][valid]
+        hashes.append((f1.astype(np.uint32) << 15) | (f2.astype(np.uint32) << 6) | dt[valid].astype(np.uint32))
+        anchors.append(times[:-k][valid])
+    if not hashes:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.int32)
+    return np.concatenate(hashes), np.concatenate(anchors)
+
+
+class FingerprintIndex:
+    """Inverted index from landmark hash to (tag, anchor frame) for MicTag matching
+
+    A query clip is matched by looking up each of its hashes and voting on
+    (tag, time offset) pairs; a true match piles its votes on one offset.
+    Cost depends on the number of query hashes, not on the number of tags.
+    The index is persisted to an .npz file and updated one tag at a time.
+    """
+
+    def __init__(self, index_file=None):
+        self.index_file = index_file
+        self._table = defaultdict(list)  # hash -> [(tag name, anchor frame)]
+        self._tag_hashes = {}  # tag name -> hashes it contributed, for cheap removal
+        self._tags = {}  # tag name -> source signature (path, mtime, size)
+        self._lock = threading.Lock()
+        self._dirty = False
+        if index_file and os.path.exists(index_file):
+            self.load()
+
+    def __contains__(self, name):
+        return name in self._tags
+
+    def add_tag(self, name, samples, sample_rate, signature=None):
+        """Index a tag's audio, replacing any previous entry for that tag"""
+        hashes, anchors = fingerprint(samples, sample_rate)
+        with self._lock:
+            self._remove(name)
+            for h, t in zip(hashes.tolist(), anchors.tolist()):
+                self._table[h].append((name, t))
+            self._tag_hashes[name] = set(hashes.tolist())
+            self._tags[name] = signature
+            self._dirty = True
+        return len(hashes)
+
+    def add_tag_file(self, name, audio_path):
+        """Index a tag from a WAV file, skipping it if the file is unchanged"""
+        stat = os.stat(audio_path)
+        signature = (audio_path, stat.st_mtime, stat.st_size)
+        if self._tags.get(name) == signature:
+            return 0
+        sample_rate, samples = wav.read(audio_path)
+        return self.add_tag(name, samples, sample_rate, signature)
+
+    def _remove(self, name):
+        if name not in self._tags:
+            return
+        del self._tags[name]
+        for h in self._tag_hashes.pop(name, ()):
+            entries = [e for e in self._table[h] if e[0] != name]
+            if entries:
+                self._table[h] = entries
+            else:
+                del self._table[h]
+        self._dirty = True
+
+    def remove_tag(self, name):
+        with self._lock:
+            self._remove(name)
+
+    def sync_tags(self, mic_tags):
+        """Index new or changed MicTags and drop deleted ones"""
+        names = {tag.name for tag in mic_tags}
+        for name in [n for n in self._tags if n not in names]:
+            self.remove_tag(name)
+        for tag in mic_tags:
+            audio_path = getattr(tag, 'audio_path', None)
+            if audio_path and os.path.exists(audio_path):
+                try:
+                    self.add_tag_file(tag.name, audio_path)
+                except Exception as e:
+                    print(f"[FingerprintIndex] Error indexing {tag.name}: {e}")
+        self.save()
+
+    def match(self, samples, sample_rate, min_matches=MIN_MATCHES):
+        """Tags matching a clip, best first, as (name, votes) pairs"""
+        hashes, anchors = fingerprint(samples, sample_rate)
+        votes = defaultdict(int)
+        with self._lock:
+            for h, t in zip(hashes.tolist(), anchors.tolist()):
+                for name, anchor in self._table.get(h, ()):
+                    votes[(name, anchor - t)] += 1
+        best = {}
+        for (name, _), count in votes.items():
+            best[name] = max(best.get(name, 0), count)
+        return sorted(((n, c) for n, c in best.items() if c >= min_matches), key=lambda x: -x[1])
+
+    def load(self):
+        try:
+            with np.load(self.index_file, allow_pickle=False) as data:
+                names = [str(n) for n in data["names"]]
+                sources = [str(s) for s in data["sources"]]
+                mtimes = data["mtimes"]
+                sizes = data["sizes"]
+                table = defaultdict(list)
+                tag_hashes = {name: set() for name in names}
+                for h, tag, t in zip(data["hashes"].tolist(), data["tags"].tolist(), data["anchors"].tolist()):
+                    table[h].append((names[tag], t))
+                    tag_hashes[names[tag]].add(h)
+        except Exception as e:
+            print(f"[FingerprintIndex] Error loading {self.index_file}: {e}")
+            return
+        with self._lock:
+            self._table = table
+            self._tag_hashes = tag_hashes
+            self._tags = {
+                name: (source, float(mtime), int(size)) if source else None
+                for name, source, mtime, size in zip(names, sources, mtimes, sizes)
+            }
+            self._dirty = False
+
+    def save(self):
+        """Write the index if it changed (atomically, via a temp file)"""
+        if not self.index_file:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            names = list(self._tags)
+            tag_ids = {name: i for i, name in enumerate(names)}
+            hashes, tags, anchors = [], [], []
+            for h, entries in self._table.items():
+                for name, t in entries:
+                    hashes.append(h)
+                    tags.append(tag_ids[name])
+                    anchors.append(t)
+            signatures = [self._tags[name] or ("", 0.0, 0) for name in names]
+            self._dirty = False
+        tmp_file = self.index_file + ".tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                np.savez(f,
+                         names=np.array(names, dtype=str),
+                         sources=np.array([s[0] for s in signatures], dtype=str),
+                         mtimes=np.array([s[1] for s in signatures], dtype=np.float64),
+                         sizes=np.array([s[2] for s in signatures], dtype=np.int64),
+                         hashes=np.array(hashes, dtype=np.uint32),
+                         tags=np.array(tags, dtype=np.int32),
+                         anchors=np.array(anchors, dtype=np.int32))
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            print(f"[FingerprintIndex] Error saving {self.index_file}: {e}")
+            with self._lock:
+                self._dirty = True
+
+
+class RollingMatcher:
+    """Keeps the last few seconds of live microphone audio and matches it against the index"""
+
+    def __init__(self, index, sample_rate, window_seconds=4.0, vad=None):
+        self.index = index
+        self.sample_rate = sample_rate
+        self.vad = vad  # Optional VoiceActivityDetector; silent windows are never matched
+        self._buffer = np.zeros(int(window_seconds * sample_rate), dtype=np.float32)
+        self._filled = 0
+
+    def push(self, chunk):
+        chunk = to_mono_float(chunk)[-len(self._buffer):]
+        n = len(chunk)
+        if not n:
+            return
+        self._buffer[:-n or None] = self._buffer[n:]
+        self._buffer[-n:] = chunk
+        self._filled = min(len(self._buffer), self._filled + n)
+
+    def match(self, min_matches=MIN_MATCHES):
+        if not self._filled:
+            return []
+        window = self._buffer[-self._filled:]
+        if self.vad is not None and not self.vad.is_active(window, self.sample_rate):
+            return []
+        return self.index.match(window, self.sample_rate, min_matches)
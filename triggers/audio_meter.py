@@ -0,0 +1,57 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+import threading
+import time
+import numpy as np
+
+
+class AudioLevelMeter(QObject):
+    """Reduces raw audio chunks to RMS/peak levels at a capped rate
+
+    Connect AudioRecorder.audio_signal to process() with Qt.DirectConnection
+    so the reduction runs on the recorder's thread and no audio buffer is
+    queued to the GUI thread; only level_changed(rms, peak) crosses over.
+    """
+    level_changed = pyqtSignal(float, float)  # rms, peak in 0.0 - 1.0
+
+    def __init__(self, max_rate=30.0, parent=None):
+        super().__init__(parent)
+        self.min_period = 1.0 / max_rate
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._sum_squares = 0.0
+        self._samples = 0
+        self._peak = 0.0
+        self._last_emit = 0.0
+
+    def process(self, chunk):
+        """Accumulate one chunk; emits at most max_rate times per second"""
+        data = np.asarray(chunk).ravel()
+        if not data.size:
+            return
+        if data.dtype.kind in "iu":
+            scale = float(np.iinfo(data.dtype).max)
+            data = data.astype(np.float32)
+            data /= scale
+        elif data.dtype != np.float32:
+            data = data.astype(np.float32)
+
+        # Single pass reductions; no abs() temporary for the peak
+        sum_squares = float(np.dot(data, data))
+        peak = max(float(data.max()), -float(data.min()))
+
+        with self._lock:
+            self._sum_squares += sum_squares
+            self._samples += data.size
+            self._peak = max(self._peak, peak)
+            now = time.monotonic()
+            if now - self._last_emit < self.min_period:
+                return
+            rms = (self._sum_squares / self._samples) ** 0.5
+            peak = self._peak
+            self._sum_squares = 0.0
+            self._samples = 0
+            self._peak = 0.0
+            self._last_emit = now
+        self.level_changed.emit(min(rms, 1.0), min(peak, 1.0))
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import threading
+import numpy as np
+import scipy.io.wavfile as wav
+
+
+class AudioTake:
+    """A finished recording held in memory until it is saved as part of a tag"""
+
+    def __init__(self, samples, sample_rate):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self._hash = None
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+    def content_hash(self):
+        """SHA-1 over the raw samples and sample rate (hashed in place, no copy)"""
+        if self._hash is None:
+            digest = hashlib.sha1(str(self.sample_rate).encode())
+            digest.update(memoryview(np.ascontiguousarray(self.samples)).cast("B"))
+            self._hash = digest.hexdigest()
+        return self._hash
+
+    def save(self, directory):
+        """Write the take as <hash>.wav in directory; identical takes share one file"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.content_hash()[:16]}.wav")
+        if not os.path.exists(path):
+            tmp_path = path + ".tmp"
+            wav.write(tmp_path, self.sample_rate, self.samples)
+            os.replace(tmp_path, path)
+        return path
+
+
+COMMON_SAMPLE_RATES = (8000, 11025, 16000, 22050, 32000, 44100, 48000, 96000)
+
+
+def recorder_sample_rate(recorder, frames):
+    """The rate AudioRecorder recorded at, read from it or, failing that, from frames / duration"""
+    for name in ('sample_rate', 'samplerate', 'fs'):
+        rate = getattr(recorder, name, None)
+        if rate:
+            return int(rate)
+    duration = getattr(recorder, 'duration', None)
+    if not duration:
+        raise ValueError("The recorder did not report its sample rate")
+    estimate = frames / duration
+    return min(COMMON_SAMPLE_RATES, key=lambda rate: abs(rate - estimate))
+
+
+class TakeCollector:
+    """Collects AudioRecorder.audio_signal chunks into one buffer as they arrive
+
+    Connect audio_signal to process() with Qt.DirectConnection so chunks
+    are copied, once, straight into preallocated storage on the recorder's
+    thread; capacity doubles when it runs out. take() hands that storage
+    over as the take's samples, so nothing is written to disk or copied
+    again until the take is saved with a tag.
+    """
+
+    def __init__(self, initial_seconds=30, expected_rate=48000):
+        self.initial_frames = int(initial_seconds * expected_rate)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the collected audio; call before the recorder starts"""
+        with self._lock:
+            self._buffer = None
+            self._frames = 0
+
+    def __len__(self):
+        return self._frames
+
+    def process(self, chunk):
+        chunk = np.asarray(chunk)
+        if not chunk.size:
+            return
+        with self._lock:
+            if self._buffer is None:
+                self._buffer = np.empty((max(self.initial_frames, len(chunk)),) + chunk.shape[1:], dtype=chunk.dtype)
+            end = self._frames + len(chunk)
+            if end > len(self._buffer):
+                grown = np.empty((max(end, 2 * len(self._buffer)),) + self._buffer.shape[1:], dtype=self._buffer.dtype)
+                grown[:self._frames] = self._buffer[:self._frames]
+                self._buffer = grown
+            self._buffer[self._frames:end] = chunk.reshape((-1,) + self._buffer.shape[1:])
+            self._frames = end
+
+    def take(self, sample_rate):
+        """The collected audio as an AudioTake (None if nothing was recorded); the collector starts over"""
+        with self._lock:
+            buffer, frames = self._buffer, self._frames
+            self._buffer = None
+            self._frames = 0
+        if not frames:
+            return None
+        return AudioTake(buffer[:frames], int(sample_rate))
+
+
+def take_from_recorder(recorder, collector):
+    """The recording AudioRecorder just finished, as an AudioTake at its real sample rate
+
+    Returns None for an empty recording and raises ValueError if the
+    sample rate can't be determined.
+    """
+    return collector.take(recorder_sample_rate(recorder, len(collector)))
@@ -0,0 +1,265 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+import threading
+import time
+from triggers.dbus_values import plain_value
+from triggers.rssi_filter import ProximityFilter
+
+try:
+    from PyQt5.QtDBus import QDBusConnection, QDBusInterface, QDBusMessage
+except ImportError:  # QtDBus isn't built on every platform (e.g. Windows wheels)
+    QDBusConnection = None
+
+BLUEZ_SERVICE = "org.bluez"
+OBJECT_MANAGER = "org.freedesktop.DBus.ObjectManager"
+PROPERTIES = "org.freedesktop.DBus.Properties"
+ADAPTER_IFACE = "org.bluez.Adapter1"
+DEVICE_IFACE = "org.bluez.Device1"
+DEVICE_EXPIRY = 30.0  # Seconds without an advertisement before a device counts as gone
+EXPIRY_CHECK_MS = 2000
+
+
+class DeviceTable:
+    """Live table of BlueZ devices keyed by object path
+
+    Every device BlueZ reports is remembered (so its address and name are
+    known when it comes back), but a device is only present while its last
+    RSSI report is younger than expiry seconds. update(), remove() and
+    expire() return something truthy only when the set of present devices
+    changed, so callers re-publish on real changes only.
+    """
+
+    def __init__(self, expiry=DEVICE_EXPIRY):
+        self.expiry = expiry
+        self._devices = {}  # object path -> {'address', 'name', 'rssi', 'seen'}; seen is None when absent
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(1 for e in self._devices.values() if e['seen'] is not None)
+
+    def update(self, path, props, now=None):
+        """Apply Device1 properties; only an RSSI reading marks a device present"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._devices.setdefault(path, {'address': "", 'name': "", 'rssi': None, 'seen': None})
+            changed = False
+            if "Address" in props:
+                entry['address'] = props["Address"]
+            if "Name" in props or "Alias" in props:
+                name = props.get("Name") or props.get("Alias") or ""
+                changed = entry['seen'] is not None and name != entry['name']
+                entry['name'] = name
+            if "RSSI" in props:
+                changed = changed or entry['seen'] is None
+                entry['rssi'] = int(props["RSSI"])
+                entry['seen'] = now
+            return changed
+
+    def remove(self, path):
+        with self._lock:
+            entry = self._devices.pop(path, None)
+            return entry is not None and entry['seen'] is not None
+
+    def expire(self, now=None):
+        """Mark devices not heard from within expiry as absent; returns their addresses"""
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            for entry in self._devices.values():
+                if entry['seen'] is not None and now - entry['seen'] > self.expiry:
+                    entry['seen'] = None
+                    entry['rssi'] = None
+                    expired.append(entry['address'])
+        return expired
+
+    def devices(self):
+        """Present devices as (address, name) pairs, strongest signal first"""
+        with self._lock:
+            entries = sorted((e for e in self._devices.values() if e['seen'] is not None),
+                             key=lambda e: -e['rssi'])
+            return [(e['address'], e['name'] or e['address']) for e in entries]
+
+    def address(self, path):
+        entry = self._devices.get(path)
+        return entry['address'] if entry else None
+
+    def rssi(self, address):
+        with self._lock:
+            return next((e['rssi'] for e in self._devices.values() if e['address'] == address), None)
+
+
+def parse_interfaces_added(args):
+    """(device path, Device1 properties) from an InterfacesAdded payload, or None for other objects"""
+    path, interfaces = args[0], args[1]
+    if DEVICE_IFACE not in interfaces:
+        return None
+    return path, interfaces[DEVICE_IFACE]
+
+
+def parse_interfaces_removed(args):
+    """Device path from an InterfacesRemoved payload, or None when no Device1 went away"""
+    path, interfaces = args[0], args[1]
+    return path if DEVICE_IFACE in interfaces else None
+
+
+def parse_properties_changed(path, args):
+    """(device path, changed properties) from a PropertiesChanged payload, or None for other interfaces"""
+    interface, changed = args[0], args[1]
+    if interface != DEVICE_IFACE:
+        return None
+    return path, changed
+
+
+def bluez_available():
+    """True when BlueZ is running on the system bus"""
+    if QDBusConnection is None:
+        return False
+    bus = QDBusConnection.systemBus()
+    if not bus.isConnected():
+        return False
+    reply = bus.interface().isServiceRegistered(BLUEZ_SERVICE)
+    return reply.isValid() and bool(reply.value())
+
+
+class _SignalRelay(QObject):
+    """Receives one D-Bus signal as a QDBusMessage and forwards (path, arguments)"""
+
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+
+    @pyqtSlot(QDBusMessage if QDBusConnection is not None else object)
+    def receive(self, message):
+        self.handler(message.path(), [plain_value(a) for a in message.arguments()])
+
+
+class QtDBusBus:
+    """The few D-Bus operations BlueZDiscovery needs, on a QDBusConnection
+
+    Tests can pass any object with the same four methods instead, or a
+    connection to a private bus running a BlueZ mock.
+    """
+
+    def __init__(self, connection=None):
+        if QDBusConnection is None:
+            raise RuntimeError("QtDBus is not available")
+        self.connection = connection if connection is not None else QDBusConnection.systemBus()
+        self._relays = []
+
+    def subscribe(self, interface, member, handler):
+        relay = _SignalRelay(handler)
+        # An empty path matches the signal from every object BlueZ exports
+        if not self.connection.connect(BLUEZ_SERVICE, "", interface, member, relay.receive):
+            raise RuntimeError(f"Could not subscribe to {interface}.{member}")
+        self._relays.append((interface, member, relay))
+
+    def unsubscribe_all(self):
+        for interface, member, relay in self._relays:
+            self.connection.disconnect(BLUEZ_SERVICE, "", interface, member, relay.receive)
+        self._relays = []
+
+    def call(self, path, interface, method, *args):
+        reply = QDBusInterface(BLUEZ_SERVICE, path, interface, self.connection).call(method, *args)
+        if reply.type() == QDBusMessage.ErrorMessage:
+            raise RuntimeError(reply.errorMessage())
+        return [plain_value(a) for a in reply.arguments()]
+
+    def managed_objects(self):
+        return self.call("/", OBJECT_MANAGER, "GetManagedObjects")[0]
+
+
+class BlueZDiscovery(QObject):
+    """Event-driven Bluetooth discovery from BlueZ D-Bus signals
+
+    Instead of polling, the device table is updated from InterfacesAdded,
+    InterfacesRemoved and PropertiesChanged (RSSI) signals, and a timer
+    expires devices that stop advertising. Exposes the same start/stop,
+    devices_found and status_update interface as BluetoothScanner, so it
+    can be registered with the sensor hub in its place.
+    """
+    devices_found = pyqtSignal(list)  # [(address, name)] whenever the set of nearby devices changes
+    device_rssi = pyqtSignal(str, int)  # address, RSSI on every signal-strength report
+    proximity_changed = pyqtSignal(str, bool)  # address, whether it is now nearby (smoothed, with hysteresis)
+    status_update = pyqtSignal(str)
+
+    def __init__(self, bus=None, adapter_path="/org/bluez/hci0", expiry=DEVICE_EXPIRY, parent=None):
+        super().__init__(parent)
+        self.bus = bus
+        self.adapter_path = adapter_path
+        self.table = DeviceTable(expiry)
+        self.proximity = ProximityFilter(lost_seconds=expiry)
+        self._running = False
+        self._expiry_timer = QTimer(self)
+        self._expiry_timer.setInterval(EXPIRY_CHECK_MS)
+        self._expiry_timer.timeout.connect(self.expire_devices)
+
+    def isRunning(self):
+        return self._running
+
+    def wait(self, *args):
+        return True  # Nothing to join; kept for BluetoothScanner compatibility
+
+    def start(self):
+        if self._running:
+            return
+        try:
+            if self.bus is None:
+                self.bus = QtDBusBus()
+            self.bus.subscribe(OBJECT_MANAGER, "InterfacesAdded", self.on_interfaces_added)
+            self.bus.subscribe(OBJECT_MANAGER, "InterfacesRemoved", self.on_interfaces_removed)
+            self.bus.subscribe(PROPERTIES, "PropertiesChanged", self.on_properties_changed)
+            for path, interfaces in self.bus.managed_objects().items():
+                self.on_interfaces_added(path, [path, interfaces])
+            self.bus.call(self.adapter_path, ADAPTER_IFACE, "StartDiscovery")
+        except Exception as e:
+            self.status_update.emit(f"Bluetooth discovery unavailable: {e}")
+            if self.bus is not None:
+                self.bus.unsubscribe_all()
+            return
+        self._running = True
+        self._expiry_timer.start()
+        self.status_update.emit("Listening for Bluetooth devices...")
+        self.devices_found.emit(self.table.devices())
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._expiry_timer.stop()
+        self.bus.unsubscribe_all()
+        try:
+            self.bus.call(self.adapter_path, ADAPTER_IFACE, "StopDiscovery")
+        except Exception as e:
+            print(f"[BlueZDiscovery] Error stopping discovery: {e}")
+        self.status_update.emit("Bluetooth discovery stopped")
+
+    def on_interfaces_added(self, _, args):
+        device = parse_interfaces_added(args)
+        if device is not None:
+            self._apply(*device)
+
+    def on_interfaces_removed(self, _, args):
+        path = parse_interfaces_removed(args)
+        if path is not None and self.table.remove(path):
+            self.devices_found.emit(self.table.devices())
+
+    def on_properties_changed(self, path, args):
+        device = parse_properties_changed(path, args)
+        if device is not None:
+            self._apply(*device)
+
+    def _apply(self, path, props):
+        if self.table.update(path, props):
+            self.devices_found.emit(self.table.devices())
+        address = self.table.address(path)
+        if "RSSI" in props and address:
+            self.device_rssi.emit(address, int(props["RSSI"]))
+            near = self.proximity.update(address, int(props["RSSI"]), time.monotonic())
+            if near is not None:
+                self.proximity_changed.emit(address, near)
+
+    def expire_devices(self):
+        now = time.monotonic()
+        if self.table.expire(now):
+            self.devices_found.emit(self.table.devices())
+        for address in self.proximity.expire(now):
+            self.proximity_changed.emit(address, False)
@@ -0,0 +1,117 @@
+import threading
+import numpy as np
+from triggers.image_features import EMBEDDING_SIZE, embed_frame
+
+DEFAULT_THRESHOLD = 0.85
+
+
+class CameraTagMatcher:
+    """Matches camera frames against every CameraTag reference image at once
+
+    All reference embeddings live in one contiguous float32 matrix with each
+    tag's rows kept adjacent, so a batch of frames is scored with a single
+    matrix product and reduced to per-tag maxima with np.maximum.reduceat.
+    Adding a tag appends rows in place; removing one compacts the matrix.
+    """
+
+    def __init__(self, default_threshold=DEFAULT_THRESHOLD):
+        self.default_threshold = default_threshold
+        self._matrix = np.empty((64, EMBEDDING_SIZE), dtype=np.float32)
+        self._rows = 0
+        self._tags = []  # Tag names in row order
+        self._spans = {}  # name -> (start, stop)
+        self._thresholds = {}
+        self._signatures = {}  # name -> image paths the rows were built from
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tags)
+
+    def _reserve(self, extra):
+        needed = self._rows + extra
+        if needed > len(self._matrix):
+            capacity = max(needed, 2 * len(self._matrix))
+            matrix = np.empty((capacity, EMBEDDING_SIZE), dtype=np.float32)
+            matrix[:self._rows] = self._matrix[:self._rows]
+            self._matrix = matrix
+
+    def _remove(self, name):
+        start, stop = self._spans.pop(name)
+        count = stop - start
+        self._matrix[start:self._rows - count] = self._matrix[stop:self._rows]
+        self._rows -= count
+        self._tags.remove(name)
+        for other in self._tags:
+            other_start, other_stop = self._spans[other]
+            if other_start >= stop:
+                self._spans[other] = (other_start - count, other_stop - count)
+
+    def set_tag(self, name, embeddings, threshold=None):
+        """Add or replace a tag's reference embeddings"""
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, EMBEDDING_SIZE)
+        with self._lock:
+            if name in self._spans:
+                self._remove(name)
+            if threshold is not None:
+                self._thresholds[name] = threshold
+            if not len(embeddings):
+                self._signatures.pop(name, None)
+                return
+            self._reserve(len(embeddings))
+            self._matrix[self._rows:self._rows + len(embeddings)] = embeddings
+            self._spans[name] = (self._rows, self._rows + len(embeddings))
+            self._rows += len(embeddings)
+            self._tags.append(name)
+
+    def remove_tag(self, name):
+        with self._lock:
+            if name in self._spans:
+                self._remove(name)
+            self._thresholds.pop(name, None)
+            self._signatures.pop(name, None)
+
+    def set_threshold(self, name, threshold):
+        with self._lock:
+            self._thresholds[name] = threshold
+
+    def sync_tags(self, camera_tags, feature_cache):
+        """Bring the matrix in line with a list of CameraTags, touching only changed tags"""
+        wanted = {tag.name: tuple(tag.image_paths) for tag in camera_tags}
+        for name in [n for n in self._signatures if n not in wanted]:
+            self.remove_tag(name)
+        for tag in camera_tags:
+            if self._signatures.get(tag.name) == wanted[tag.name]:
+                continue
+            threshold = getattr(tag, 'threshold', None)
+            self.set_tag(tag.name, feature_cache.embeddings_for(tag.image_paths), threshold)
+            self._signatures[tag.name] = wanted[tag.name]
+
+    def scores(self, frame_embeddings):
+        """Best similarity per tag for each frame: ((n_frames, n_tags) array, tag names)"""
+        frame_embeddings = np.asarray(frame_embeddings, dtype=np.float32).reshape(-1, EMBEDDING_SIZE)
+        with self._lock:
+            if not self._tags:
+                return np.empty((len(frame_embeddings), 0), dtype=np.float32), []
+            tags = list(self._tags)
+            starts = np.array([self._spans[name][0] for name in tags])
+            similarity = frame_embeddings @ self._matrix[:self._rows].T
+        return np.maximum.reduceat(similarity, starts, axis=1), tags
+
+    def match(self, frame_embeddings, top_k=3):
+        """Tags matched by each frame, best first, as lists of (name, score)"""
+        per_tag, tags = self.scores(frame_embeddings)
+        if not tags:
+            return [[] for _ in range(len(per_tag))]
+        thresholds = np.array([self._thresholds.get(name, self.default_threshold) for name in tags],
+                              dtype=np.float32)
+        k = min(top_k, len(tags))
+        top = np.argpartition(-per_tag, k - 1, axis=1)[:, :k]
+        matches = []
+        for row, candidates in zip(per_tag, top):
+            candidates = candidates[np.argsort(-row[candidates])]
+            matches.append([(tags[i], float(row[i])) for i in candidates if row[i] >= thresholds[i]])
+        return matches
+
+    def match_frames(self, frames, top_k=3):
+        """Embed RGB frames and match them in one batch"""
+        return self.match(np.vstack([embed_frame(frame) for frame in frames]), top_k)
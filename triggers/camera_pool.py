@@ -0,0 +1,269 @@
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+import os
+from triggers.camera import ImageProcessor
+from triggers.image_features import FEATURE_VERSION, extract_embedding, load_image
+
+MAX_CRASH_RETRIES = 1  # Times an image is resubmitted after its worker pool broke
+POLL_SECONDS = 0.2  # How quickly a running batch notices it was replaced or shut down
+
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def validate_image(image_path):
+    """Run ImageProcessor's own checks on one image and return its result dict
+
+    The processor is created once per process (so once per pool worker)
+    and its image_processed/processing_error signals are collected with
+    direct connections, so this works without an event loop.
+    """
+    global _processor
+    with _processor_lock:
+        if _processor is None:
+            _processor = ImageProcessor()
+        processor = _processor
+        results, errors = [], []
+        on_result, on_error = results.append, errors.append
+        processor.image_processed.connect(on_result, Qt.DirectConnection)
+        processor.processing_error.connect(on_error, Qt.DirectConnection)
+        try:
+            processor.process_images([image_path])
+            if isinstance(processor, QThread):
+                processor.wait()
+        finally:
+            processor.image_processed.disconnect(on_result)
+            processor.processing_error.disconnect(on_error)
+    if results:
+        return dict(results[-1])
+    return {'valid': False, 'message': f"❌ {errors[-1] if errors else 'Image could not be processed'}",
+            'style': 'error'}
+
+
+def analyze_image(image_path):
+    """Validate one image with ImageProcessor and embed it if it is valid; never raises"""
+    try:
+        result = validate_image(image_path)
+        valid = bool(result.get('valid'))
+        result.update({
+            'path': image_path,
+            'valid': valid,
+            'style': result.get('style', 'success' if valid else 'error'),
+            'embedding': extract_embedding(load_image(image_path)) if valid else None,
+            'feature_version': FEATURE_VERSION,
+        })
+        result.pop('index', None)  # Position within the one-image run, not the batch
+        result.pop('total', None)
+        return result
+    except Exception as e:
+        return failed_result(image_path, str(e))
+
+
+def failed_result(image_path, message):
+    return {
+        'path': image_path,
+        'valid': False,
+        'message': f"❌ {message}",
+        'style': 'error',
+        'embedding': None,
+        'feature_version': FEATURE_VERSION,
+    }
+
+
+def _limit_worker_memory(limit_bytes):
+    """Worker initializer: cap the address space when a limit was configured"""
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    except (ImportError, ValueError, OSError):
+        pass  # Not supported on this platform
+
+
+class ParallelImageProcessor(QThread):
+    """Process-pool drop-in for ImageProcessor.process_images
+
+    Each image is checked by ImageProcessor and embedded in a worker
+    process, and image_processed is emitted in completion order. Images
+    can be cancelled while the batch is running (e.g. when removed from
+    the grid). If a worker dies, only the images that hadn't finished are
+    resubmitted to a fresh pool. Nothing here blocks the caller: a new
+    batch replaces the running one on this thread, and shutdown() joins
+    the workers from a background thread.
+    """
+    image_processed = pyqtSignal(dict)
+    processing_complete = pyqtSignal(dict)
+    processing_error = pyqtSignal(str)
+    status_update = pyqtSignal(str)
+
+    def __init__(self, max_workers=None, memory_limit_mb=None, tasks_per_worker=25, feature_cache=None):
+        super().__init__()
+        self.feature_cache = feature_cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.memory_limit_mb = memory_limit_mb  # Optional per-worker address-space cap; None = no cap
+        self.tasks_per_worker = tasks_per_worker
+        self.results = {}  # path -> last result for that path
+        self._executor = None
+        self._next_paths = None  # Batch waiting to replace the running one
+        self._busy = False
+        self._stopping = False
+        self._futures = {}  # future -> path
+        self._cancelled = set()
+        self._lock = threading.Lock()
+        self.finished.connect(self._start_queued)
+
+    def _get_executor(self):
+        if self._executor is None:
+            # Spawn rather than fork: forking a process that runs Qt threads is unsafe
+            kwargs = {'max_workers': self.max_workers, 'mp_context': multiprocessing.get_context("spawn")}
+            if self.memory_limit_mb:
+                kwargs.update(initializer=_limit_worker_memory, initargs=(self.memory_limit_mb * 1024 * 1024,))
+            try:
+                # Recycle workers periodically so decoder memory can't creep up
+                self._executor = ProcessPoolExecutor(max_tasks_per_child=self.tasks_per_worker, **kwargs)
+            except TypeError:
+                self._executor = ProcessPoolExecutor(**kwargs)  # Python < 3.11
+        return self._executor
+
+    def _discard_executor(self):
+        """Drop the current pool without waiting for it; its workers are joined in the background"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            threading.Thread(target=executor.shutdown, kwargs={'wait': True, 'cancel_futures': True},
+                             name="ImagePoolShutdown", daemon=True).start()
+
+    def process_images(self, image_paths):
+        """Start processing a batch, replacing any batch still in progress"""
+        with self._lock:
+            self._cancel_locked()
+            self._next_paths = list(dict.fromkeys(image_paths))
+            self._stopping = False
+            if self._busy:
+                return  # The running thread picks the batch up once the current one stops
+            self._busy = True
+        self.start()
+
+    def _start_queued(self):
+        # A batch can arrive after run() last looked but before the thread finished
+        with self._lock:
+            if self._next_paths is None:
+                self._busy = False
+                return
+        self.start()
+
+    def cancel(self, image_path):
+        """Drop an image from the running batch"""
+        with self._lock:
+            self._cancelled.add(image_path)
+            for future, path in self._futures.items():
+                if path == image_path:
+                    future.cancel()  # No-op if a worker already picked it up
+
+    def cancel_all(self):
+        with self._lock:
+            self._cancel_locked()
+
+    def _cancel_locked(self):
+        self._cancelled.update(self._futures.values())
+        for future in self._futures:
+            future.cancel()
+
+    def run(self):
+        while True:
+            with self._lock:
+                paths, self._next_paths = self._next_paths, None
+                if paths is None:
+                    return
+                self._cancelled = set()
+            if paths:
+                self._run_batch(paths)
+
+    def _superseded(self):
+        with self._lock:
+            return self._stopping or self._next_paths is not None
+
+    def _run_batch(self, paths):
+        self.status_update.emit(f"Processing {len(paths)} image{'s' if len(paths) > 1 else ''} "
+                                f"on {min(self.max_workers, len(paths))} cores...")
+        done = 0
+        valid = 0
+
+        def emit(result):
+            nonlocal done, valid
+            with self._lock:
+                total = len(paths) - len(self._cancelled)
+            done += 1
+            valid += result['valid']
+            self.results[result['path']] = result
+            result.update({'index': done, 'total': max(total, done)})
+            self.image_processed.emit(result)
+
+        try:
+            # Images whose content hash is already cached skip the pool entirely
+            remaining = []
+            for path in paths:
+                cached = self.feature_cache.get(path) if self.feature_cache else None
+                if cached is None:
+                    remaining.append(path)
+                elif path not in self._cancelled:
+                    emit(cached)
+
+            crashes = {}  # path -> times its pool broke under it
+            while remaining and not self._superseded():
+                executor = self._get_executor()
+                with self._lock:
+                    self._futures = {
+                        executor.submit(analyze_image, path): path
+                        for path in remaining if path not in self._cancelled
+                    }
+                    futures = list(self._futures)
+                remaining = []
+                broken = False
+                pending = set(futures)
+                while pending and not self._superseded():
+                    finished, pending = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        with self._lock:
+                            path = self._futures.get(future)
+                        if future.cancelled() or path in self._cancelled:
+                            continue
+                        try:
+                            result = future.result()
+                        except BrokenProcessPool:
+                            # A worker died (e.g. out of memory); every unfinished image fails with it
+                            broken = True
+                            crashes[path] = crashes.get(path, 0) + 1
+                            if crashes[path] > MAX_CRASH_RETRIES:
+                                emit(failed_result(path, "Image worker crashed while processing (image too large?)"))
+                            else:
+                                remaining.append(path)
+                            continue
+                        if self.feature_cache:
+                            self.feature_cache.put(result)
+                        emit(result)
+                if broken:
+                    self._discard_executor()
+
+            if not self._superseded():
+                self.processing_complete.emit({
+                    'valid': valid > 0,
+                    'total_processed': done,
+                    'valid_count': valid,
+                })
+        except Exception as e:
+            self.processing_error.emit(f"Error processing images: {str(e)}")
+        finally:
+            with self._lock:
+                self._futures = {}
+            if self.feature_cache:
+                self.feature_cache.save()
+
+    def shutdown(self):
+        """Stop the batch and the worker processes without blocking the caller"""
+        with self._lock:
+            self._next_paths = None
+            self._stopping = True
+            self._cancel_locked()
+        self._discard_executor()
@@ -0,0 +1,126 @@
+import os
+import time
+import numpy as np
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def system_load():
+    """Current CPU load as a fraction of all cores (0.0 - 1.0+)"""
+    if psutil is not None:
+        return psutil.cpu_percent(interval=None) / 100.0
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0  # Load average not available (Windows without psutil)
+
+
+def motion_signature(frame, size=32):
+    """Tiny grayscale thumbnail of a frame, made by striding (no resampling)"""
+    height, width = frame.shape[:2]
+    step = max(1, min(height, width) // size)
+    small = frame[::step, ::step]
+    if small.ndim == 3:
+        small = small.mean(axis=2)
+    return small.astype(np.float32)
+
+
+class AdaptiveCameraScheduler:
+    """Decides when BackgroundMonitor should run full camera recognition
+
+    Every sampled frame gets a cheap frame-difference check against the
+    last frame that was fully matched. Full matching only runs when the
+    scene changed, the current match is losing confidence, or nothing was
+    matched for refresh_interval seconds. The sampling interval grows with
+    CPU load and while the scene is static.
+    """
+
+    def __init__(self, min_interval=0.5, max_interval=5.0, motion_threshold=8.0,
+                 confidence_decay=0.05, refresh_interval=30.0, target_load=0.6, load_fn=system_load):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.motion_threshold = motion_threshold
+        self.confidence_decay = confidence_decay
+        self.refresh_interval = refresh_interval
+        self.target_load = target_load
+        self.load_fn = load_fn
+        self.interval = min_interval
+        self._reference = None  # Signature of the last fully matched frame
+        self._last_match_time = None
+        self._confidence = None
+        self._peak_confidence = None
+        self._static_samples = 0
+
+    def reset(self):
+        self._reference = None
+        self._last_match_time = None
+        self._confidence = None
+        self._peak_confidence = None
+        self._static_samples = 0
+        self.interval = self.min_interval
+
+    def motion(self, frame):
+        """Mean absolute difference to the last matched frame (0-255); inf if none yet"""
+        signature = motion_signature(frame)
+        if self._reference is None or self._reference.shape != signature.shape:
+            return float('inf'), signature
+        return float(np.abs(signature - self._reference).mean()), signature
+
+    def should_match(self, frame, now=None):
+        """Cheap gate run on every sampled frame; True means run full recognition"""
+        now = time.monotonic() if now is None else now
+        change, signature = self.motion(frame)
+        scene_changed = change >= self.motion_threshold
+        decaying = self.confidence_decaying()
+        escalate = (
+            scene_changed
+            or self._last_match_time is None
+            or now - self._last_match_time >= self.refresh_interval
+            or decaying
+        )
+        if scene_changed:
+            # A new scene starts a new match window, so decay is measured from its own peak
+            self._peak_confidence = None
+        elif decaying:
+            # This drop is being handled; only a further drop from here escalates again
+            self._peak_confidence = self._confidence
+        if escalate:
+            self._reference = signature
+            self._static_samples = 0
+        else:
+            self._static_samples += 1
+        self._update_interval()
+        return escalate
+
+    def record_match(self, confidence, now=None):
+        """Report the best match confidence from a full recognition run
+
+        The peak is kept across runs until the scene changes, so a slowly
+        falling confidence is noticed by confidence_decaying(). Once a drop
+        has triggered a run, the peak is lowered to the confidence it
+        dropped to.
+        """
+        self._last_match_time = time.monotonic() if now is None else now
+        if self._peak_confidence is None or confidence > self._peak_confidence:
+            self._peak_confidence = confidence
+        self._confidence = confidence
+
+    def confidence_decaying(self):
+        if self._confidence is None or self._peak_confidence is None:
+            return False
+        return self._peak_confidence - self._confidence >= self.confidence_decay
+
+    def _update_interval(self):
+        # Back off while the scene is static, then scale further by CPU pressure
+        interval = self.min_interval * (1.5 ** min(self._static_samples, 10))
+        load = self.load_fn()
+        if load > self.target_load:
+            interval *= load / self.target_load
+        self.interval = min(self.max_interval, max(self.min_interval, interval))
+
+    def next_interval(self):
+        """Seconds to wait before sampling the next frame"""
+        return self.interval
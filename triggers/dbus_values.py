@@ -0,0 +1,22 @@
+try:
+    from PyQt5.QtDBus import QDBusObjectPath, QDBusVariant
+except ImportError:  # QtDBus isn't built on every platform (e.g. Windows wheels)
+    QDBusObjectPath = QDBusVariant = None
+
+
+def plain_value(value):
+    """Strip QDBusVariant/QDBusObjectPath wrappers from a value delivered by QtDBus
+
+    Dicts (a{sv} property maps) and lists (arrays of object paths) are
+    unwrapped recursively, so callers only ever see plain Python values.
+    """
+    if QDBusVariant is not None:
+        if isinstance(value, QDBusVariant):
+            value = value.variant()
+        if isinstance(value, QDBusObjectPath):
+            value = value.path()
+    if isinstance(value, dict):
+        return {k: plain_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [plain_value(v) for v in value]
+    return value
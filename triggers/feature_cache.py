@@ -0,0 +1,167 @@
+import hashlib
+import os
+import threading
+import numpy as np
+from triggers.image_features import FEATURE_VERSION, EMBEDDING_SIZE
+from triggers.camera_pool import analyze_image
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_feature_cache(cache_file):
+    """Return the shared cache for a file so the UI and the monitor use one instance"""
+    cache_file = os.path.abspath(cache_file)
+    with _caches_lock:
+        if cache_file not in _caches:
+            _caches[cache_file] = FeatureCache(cache_file)
+        return _caches[cache_file]
+
+
+class FeatureCache:
+    """Image features persisted in one .npz file, keyed by content hash and feature version
+
+    The file is only read on first access. Entries for other feature versions
+    are ignored, so changing the extractor transparently invalidates them.
+    """
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+        self._entries = None  # hash -> (valid, message, embedding)
+        self._hashes = {}  # path -> (mtime, size, hash)
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with np.load(self.cache_file, allow_pickle=False) as data:
+                if str(data["version"]) != FEATURE_VERSION:
+                    print(f"[FeatureCache] Discarding features from {data['version']}")
+                    return
+                for key, valid, message, embedding in zip(data["hashes"], data["valid"],
+                                                          data["messages"], data["embeddings"]):
+                    self._entries[str(key)] = (bool(valid), str(message), embedding)
+        except Exception as e:
+            print(f"[FeatureCache] Error loading {self.cache_file}: {e}")
+
+    def content_hash(self, path):
+        """Hash of a file, re-read only if its mtime or size changed"""
+        stat = os.stat(path)
+        with self._lock:
+            known = self._hashes.get(path)
+        if known and known[0] == stat.st_mtime and known[1] == stat.st_size:
+            return known[2]
+        digest = file_hash(path)
+        with self._lock:
+            self._hashes[path] = (stat.st_mtime, stat.st_size, digest)
+        return digest
+
+    def get(self, path):
+        """Cached analysis result for an image, or None"""
+        try:
+            digest = self.content_hash(path)
+        except OSError:
+            return None
+        with self._lock:
+            self._load()
+            entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        valid, message, embedding = entry
+        return {
+            'path': path,
+            'valid': valid,
+            'message': message,
+            'style': 'success' if valid else 'error',
+            'embedding': embedding if valid else None,
+            'feature_version': FEATURE_VERSION,
+            'cached': True,
+        }
+
+    def put(self, result):
+        """Store an analyze_image result"""
+        if result.get('feature_version') != FEATURE_VERSION:
+            return
+        try:
+            digest = self.content_hash(result['path'])
+        except OSError:
+            return
+        embedding = result.get('embedding')
+        if embedding is None:
+            embedding = np.zeros(EMBEDDING_SIZE, dtype=np.float32)
+        with self._lock:
+            self._load()
+            self._entries[digest] = (bool(result['valid']), result['message'],
+                                     np.asarray(embedding, dtype=np.float32))
+            self._dirty = True
+
+    def get_or_compute(self, path):
+        """Cached result, analyzing (and caching) the image on a miss"""
+        result = self.get(path)
+        if result is None:
+            result = analyze_image(path)
+            self.put(result)
+        return result
+
+    def embeddings_for(self, image_paths):
+        """Embeddings for the valid images among image_paths, as a (n, EMBEDDING_SIZE) array"""
+        rows = [r['embedding'] for r in map(self.get_or_compute, image_paths) if r['valid']]
+        self.save()
+        if not rows:
+            return np.empty((0, EMBEDDING_SIZE), dtype=np.float32)
+        return np.vstack(rows)
+
+    def prune(self, keep_paths):
+        """Drop entries not referenced by any of keep_paths"""
+        keep = set()
+        for path in keep_paths:
+            try:
+                keep.add(self.content_hash(path))
+            except OSError:
+                continue
+        with self._lock:
+            self._load()
+            stale = [key for key in self._entries if key not in keep]
+            for key in stale:
+                del self._entries[key]
+            self._dirty = self._dirty or bool(stale)
+
+    def save(self):
+        """Write the cache if it changed (atomically, via a temp file)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            keys = list(self._entries)
+            entries = [self._entries[key] for key in keys]
+            self._dirty = False
+        embeddings = (np.vstack([e[2] for e in entries]) if entries
+                      else np.empty((0, EMBEDDING_SIZE), dtype=np.float32))
+        tmp_file = self.cache_file + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                np.savez(f,
+                         version=np.array(FEATURE_VERSION),
+                         hashes=np.array(keys, dtype="U40"),
+                         valid=np.array([e[0] for e in entries], dtype=bool),
+                         messages=np.array([e[1] for e in entries], dtype=str),
+                         embeddings=embeddings.astype(np.float32))
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"[FeatureCache] Error saving {self.cache_file}: {e}")
+            with self._lock:
+                self._dirty = True
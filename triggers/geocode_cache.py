@@ -0,0 +1,125 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+PRECISION = 4  # Decimal places kept in the key; 4 is ~11 m of latitude
+TTL_SECONDS = 30 * 86400
+MAX_ENTRIES = 10000
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_geocode_cache(cache_file, precision=PRECISION):
+    """Return the shared cache for a file so the UI and the monitor use one instance"""
+    cache_file = os.path.abspath(cache_file)
+    with _caches_lock:
+        if cache_file not in _caches:
+            _caches[cache_file] = GeocodeCache(cache_file, precision)
+        return _caches[cache_file]
+
+
+class GeocodeCache:
+    """Disk-backed LRU cache of reverse-geocoding results
+
+    Keys are coordinates rounded to precision decimal places, so nearby
+    fixes share an entry. Entries expire after ttl seconds; beyond
+    max_entries the least recently used ones are evicted. Stored in SQLite
+    so separate processes can share the same file safely.
+    """
+
+    def __init__(self, cache_file, precision=PRECISION, ttl=TTL_SECONDS, max_entries=MAX_ENTRIES):
+        self.cache_file = cache_file
+        self.precision = precision
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._conn = sqlite3.connect(cache_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode (key TEXT PRIMARY KEY, result TEXT NOT NULL, "
+            "created REAL NOT NULL, used REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS geocode_used ON geocode (used)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def key(self, latitude, longitude):
+        return f"{latitude:.{self.precision}f},{longitude:.{self.precision}f}"
+
+    def get(self, latitude, longitude, now=None):
+        """Cached result for a position, or None on a miss or an expired entry"""
+        now = time.time() if now is None else now
+        key = self.key(latitude, longitude)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT result, created FROM geocode WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM geocode WHERE key = ?", (key,))
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE geocode SET used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, latitude, longitude, result, now=None):
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode (key, result, created, used) VALUES (?, ?, ?, ?)",
+                (self.key(latitude, longitude), json.dumps(result), now, now))
+            count = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM geocode WHERE key IN (SELECT key FROM geocode ORDER BY used LIMIT ?)",
+                    (count - self.max_entries,))
+
+    def resolve(self, latitude, longitude, geocoder):
+        """Cached result, or geocoder(latitude, longitude) stored for next time"""
+        result = self.get(latitude, longitude)
+        if result is None:
+            result = geocoder(latitude, longitude)
+            if result is not None:
+                self.put(latitude, longitude, result)
+        return result
+
+    def metrics(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM geocode")
+
+
+class StubGeocoder:
+    """Offline stand-in for the network geocoder, for tests and development
+
+    Returns results shaped like LocationFetcher's location_found payload;
+    known positions can be given addresses, anything else gets a
+    synthetic one. calls counts lookups so tests can assert cache hits.
+    """
+
+    def __init__(self, addresses=None):
+        self.addresses = addresses or {}  # (lat, lon) rounded to 4 places -> address
+        self.calls = 0
+
+    def __call__(self, latitude, longitude):
+        self.calls += 1
+        address = self.addresses.get((round(latitude, 4), round(longitude, 4)),
+                                     f"Stub address {latitude:.4f}, {longitude:.4f}")
+        return {'address': address, 'latitude': latitude, 'longitude': longitude}
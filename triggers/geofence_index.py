@@ -0,0 +1,145 @@
+import math
+import re
+import threading
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+CELL_DEGREES = 0.01  # Bucket size: ~1.1 km of latitude, comparable to a 6-character geohash
+DEFAULT_RADIUS_M = 50.0
+
+
+def parse_radius(radius):
+    """Radius in metres from a number or a LocationTag radius string such as '50m' or '1.5km'"""
+    if isinstance(radius, (int, float)):
+        return float(radius)
+    match = re.match(r"^\s*([\d.]+)\s*(km|m)?\s*$", str(radius or ""), re.IGNORECASE)
+    if not match:
+        return DEFAULT_RADIUS_M
+    value = float(match.group(1))
+    return value * 1000.0 if (match.group(2) or "m").lower() == "km" else value
+
+
+def haversine(lat, lon, lats, lons):
+    """Distances in metres from one point to arrays of points (all in radians)"""
+    dlat = lats - lat
+    dlon = lons - lon
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _tag_geometry(tag):
+    data = tag.to_dict() if hasattr(tag, 'to_dict') else dict(tag)
+    lat = data.get('latitude', getattr(tag, 'latitude', None))
+    lon = data.get('longitude', getattr(tag, 'longitude', None))
+    radius = data.get('radius', getattr(tag, 'radius', DEFAULT_RADIUS_M))
+    return lat, lon, parse_radius(radius)
+
+
+class GeofenceIndex:
+    """Spatial index over LocationTag geofences
+
+    Each fence is stored once in flat coordinate arrays and registered in
+    every fixed-size lat/lon grid bucket its circle overlaps. A position
+    lookup reads the single bucket containing it and computes exact
+    distances for just those candidates with a vectorized haversine, so
+    the cost depends on how many fences are near, not on how many exist.
+    set_tag()/remove_tag() touch only the buckets of the changed fence.
+    """
+
+    def __init__(self, cell_degrees=CELL_DEGREES, capacity=64):
+        self.cell_degrees = cell_degrees
+        self._lats = np.zeros(capacity, dtype=np.float64)  # radians
+        self._lons = np.zeros(capacity, dtype=np.float64)
+        self._radii = np.zeros(capacity, dtype=np.float64)  # metres
+        self._names = [None] * capacity
+        self._slots = {}  # name -> slot
+        self._cells = {}  # name -> buckets it is registered in
+        self._free = []
+        self._buckets = {}  # (row, col) -> set of slots
+        self._signatures = {}  # name -> (lat, lon, radius) for cheap sync
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees))
+
+    def _covered_cells(self, lat, lon, radius):
+        dlat = math.degrees(radius / EARTH_RADIUS_M)
+        dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+        row0, col0 = self._cell(lat - dlat, lon - dlon)
+        row1, col1 = self._cell(lat + dlat, lon + dlon)
+        return [(r, c) for r in range(row0, row1 + 1) for c in range(col0, col1 + 1)]
+
+    def _allocate(self):
+        if self._free:
+            return self._free.pop()
+        slot = len(self._slots)
+        if slot == len(self._lats):
+            capacity = 2 * len(self._lats)
+            self._lats = np.resize(self._lats, capacity)
+            self._lons = np.resize(self._lons, capacity)
+            self._radii = np.resize(self._radii, capacity)
+            self._names.extend([None] * (capacity - len(self._names)))
+        return slot
+
+    def _remove(self, name):
+        slot = self._slots.pop(name, None)
+        if slot is None:
+            return
+        for cell in self._cells.pop(name):
+            bucket = self._buckets[cell]
+            bucket.discard(slot)
+            if not bucket:
+                del self._buckets[cell]
+        self._names[slot] = None
+        self._signatures.pop(name, None)
+        self._free.append(slot)
+
+    def set_tag(self, name, latitude, longitude, radius):
+        """Add or move a geofence (degrees, radius in metres or a '50m' string)"""
+        radius = parse_radius(radius)
+        with self._lock:
+            self._remove(name)
+            slot = self._allocate()
+            self._slots[name] = slot
+            self._names[slot] = name
+            self._lats[slot] = math.radians(latitude)
+            self._lons[slot] = math.radians(longitude)
+            self._radii[slot] = radius
+            cells = self._covered_cells(latitude, longitude, radius)
+            for cell in cells:
+                self._buckets.setdefault(cell, set()).add(slot)
+            self._cells[name] = cells
+            self._signatures[name] = (latitude, longitude, radius)
+
+    def remove_tag(self, name):
+        with self._lock:
+            self._remove(name)
+
+    def sync_tags(self, location_tags):
+        """Re-index only added, moved or resized LocationTags and drop deleted ones"""
+        names = set()
+        for tag in location_tags:
+            lat, lon, radius = _tag_geometry(tag)
+            if lat is None or lon is None:
+                continue
+            names.add(tag.name)
+            if self._signatures.get(tag.name) != (lat, lon, radius):
+                self.set_tag(tag.name, lat, lon, radius)
+        for name in [n for n in self._slots if n not in names]:
+            self.remove_tag(name)
+
+    def match(self, latitude, longitude):
+        """Geofences containing a position, nearest first, as (name, distance in metres)"""
+        with self._lock:
+            slots = self._buckets.get(self._cell(latitude, longitude))
+            if not slots:
+                return []
+            slots = np.fromiter(slots, dtype=np.int64, count=len(slots))
+            distances = haversine(math.radians(latitude), math.radians(longitude),
+                                  self._lats[slots], self._lons[slots])
+            inside = distances <= self._radii[slots]
+            hits = [(self._names[s], float(d)) for s, d in zip(slots[inside], distances[inside])]
+        return sorted(hits, key=lambda h: h[1])
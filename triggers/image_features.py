@@ -0,0 +1,60 @@
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import Qt
+import numpy as np
+
+# Bump whenever extract_embedding or validation changes so cached features are recomputed
+FEATURE_VERSION = "thumb16-rgb64-v2"
+EMBEDDING_SIZE = 16 * 16 + 4 * 4 * 4
+
+
+def _to_array(image, channels):
+    """View a QImage's pixels as a (h, w, channels) uint8 array"""
+    ptr = image.constBits()
+    ptr.setsize(image.byteCount())
+    rows = np.frombuffer(ptr, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    return rows[:, :image.width() * channels].reshape(image.height(), image.width(), channels).copy()
+
+
+def load_image(image_path):
+    """Decode an image file, raising ValueError if it cannot be read"""
+    image = QImage(image_path)
+    if image.isNull():
+        raise ValueError("Unreadable image file")
+    return image
+
+
+def _scaled(image, size, image_format):
+    return image.scaled(size, size, Qt.IgnoreAspectRatio,
+                        Qt.SmoothTransformation).convertToFormat(image_format)
+
+
+def extract_embedding(image):
+    """Compact L2-normalized descriptor: 16x16 luminance layout + 4x4x4 RGB histogram"""
+    gray = _to_array(_scaled(image, 16, QImage.Format_Grayscale8), 1).astype(np.float32).ravel()
+    gray -= gray.mean()
+    norm = np.linalg.norm(gray)
+    if norm > 0:
+        gray /= norm
+
+    rgb = _to_array(_scaled(image, 32, QImage.Format_RGB888), 3).reshape(-1, 3) // 64
+    bins = rgb[:, 0].astype(np.int32) * 16 + rgb[:, 1] * 4 + rgb[:, 2]
+    hist = np.bincount(bins, minlength=64).astype(np.float32)
+    hist /= np.linalg.norm(hist) or 1.0
+
+    embedding = np.concatenate([gray, hist])
+    embedding /= np.linalg.norm(embedding) or 1.0
+    return embedding.astype(np.float32)
+
+
+def frame_to_image(frame):
+    """Wrap an (h, w, 3) uint8 RGB frame as a QImage without copying"""
+    frame = np.ascontiguousarray(frame, dtype=np.uint8)
+    height, width = frame.shape[:2]
+    image = QImage(frame.data, width, height, frame.strides[0], QImage.Format_RGB888)
+    image.ndarray = frame  # Keep the buffer alive as long as the image
+    return image
+
+
+def embed_frame(frame):
+    """Embedding for a live RGB camera frame, comparable to reference embeddings"""
+    return extract_embedding(frame_to_image(frame))
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+from scipy.fft import dct
+import scipy.io.wavfile as wav
+from triggers.audio_fingerprint import to_mono_float, resample
+from triggers.feature_cache import file_hash
+
+# Every cached array is tied to these values through params_key()
+FEATURE_PARAMS = {
+    "sample_rate": 16000,
+    "n_fft": 512,
+    "hop": 160,
+    "n_mels": 40,
+    "n_mfcc": 13,
+    "fmin": 60.0,
+    "fmax": 7600.0,
+}
+
+
+def params_key(params=FEATURE_PARAMS):
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:8]
+
+
+def _mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _hz(mel):
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+
+def mel_filterbank(params=FEATURE_PARAMS):
+    """Triangular mel filters, shape (n_mels, n_fft // 2 + 1)"""
+    n_bins = params["n_fft"] // 2 + 1
+    mels = np.linspace(_mel(params["fmin"]), _mel(params["fmax"]), params["n_mels"] + 2)
+    bins = np.floor((params["n_fft"] + 1) * _hz(mels) / params["sample_rate"]).astype(int)
+    bank = np.zeros((params["n_mels"], n_bins), dtype=np.float32)
+    for i in range(params["n_mels"]):
+        left, center, right = bins[i], bins[i + 1], bins[i + 2]
+        if center > left:
+            bank[i, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[i, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+def mfcc(samples, sample_rate, params=FEATURE_PARAMS):
+    """MFCCs (frames, n_mfcc) after one resample to the canonical rate"""
+    audio = resample(to_mono_float(samples), sample_rate, params["sample_rate"])
+    n_fft, hop = params["n_fft"], params["hop"]
+    if len(audio) < n_fft:
+        return np.empty((0, params["n_mfcc"]), dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(audio, n_fft)[::hop]
+    power = np.abs(np.fft.rfft(frames * np.hanning(n_fft).astype(np.float32), axis=1)) ** 2
+    log_mel = np.log(power @ mel_filterbank(params).T + 1e-10)
+    return dct(log_mel, type=2, axis=1, norm="ortho")[:, :params["n_mfcc"]].astype(np.float32)
+
+
+def summary_vector(features):
+    """Fixed-size (mean, std) summary of an MFCC sequence for quick comparisons"""
+    features = np.asarray(features, dtype=np.float32)
+    if not len(features):
+        return np.zeros(2 * features.shape[1], dtype=np.float32)
+    return np.concatenate([features.mean(axis=0), features.std(axis=0)])
+
+
+class MicFeatureCache:
+    """MFCC features per MicTag recording, stored as float16 .npy files
+
+    Files are named <audio content hash>_<params key>.npy, so a changed
+    recording or changed FEATURE_PARAMS simply misses the cache. A small
+    manifest remembers each audio file's hash by mtime/size so lookups
+    don't re-read the audio either. Cached features are opened
+    memory-mapped; audio is only decoded on a miss.
+    """
+
+    def __init__(self, cache_dir, params=FEATURE_PARAMS):
+        self.cache_dir = cache_dir
+        self.params = params
+        self.key = params_key(params)
+        self.manifest_file = os.path.join(cache_dir, "manifest.json")
+        self._manifest = None  # audio path -> [mtime, size, hash]
+        self._lock = threading.Lock()
+
+    def _load_manifest(self):
+        if self._manifest is not None:
+            return
+        try:
+            with open(self.manifest_file, "r") as f:
+                self._manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._manifest = {}
+
+    def _save_manifest(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = self.manifest_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self._manifest, f, indent=4)
+        os.replace(tmp_file, self.manifest_file)
+
+    def audio_hash(self, audio_path):
+        stat = os.stat(audio_path)
+        with self._lock:
+            self._load_manifest()
+            known = self._manifest.get(audio_path)
+        if known and known[0] == stat.st_mtime and known[1] == stat.st_size:
+            return known[2]
+        digest = file_hash(audio_path)
+        with self._lock:
+            self._manifest[audio_path] = [stat.st_mtime, stat.st_size, digest]
+            self._save_manifest()
+        return digest
+
+    def feature_path(self, audio_path):
+        return os.path.join(self.cache_dir, f"{self.audio_hash(audio_path)[:16]}_{self.key}.npy")
+
+    def features(self, audio_path):
+        """MFCCs for a recording (memory-mapped float16), computing them on a miss"""
+        path = self.feature_path(audio_path)
+        if os.path.exists(path):
+            return np.load(path, mmap_mode="r")
+        sample_rate, samples = wav.read(audio_path)
+        features = mfcc(samples, sample_rate, self.params).astype(np.float16)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "wb") as f:
+            np.save(f, features)
+        os.replace(tmp_file, path)
+        return np.load(path, mmap_mode="r")
+
+    def similar_tags(self, samples, sample_rate, mic_tags, top_k=3):
+        """Tags whose cached features are closest to a clip, as (name, cosine similarity) pairs"""
+        query = summary_vector(mfcc(samples, sample_rate, self.params))
+        names, vectors = [], []
+        for tag in mic_tags:
+            audio_path = getattr(tag, 'audio_path', None)
+            if audio_path and os.path.exists(audio_path):
+                names.append(tag.name)
+                vectors.append(summary_vector(self.features(audio_path)))
+        if not names:
+            return []
+        vectors = np.stack(vectors)
+        scores = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query) + 1e-10)
+        order = np.argsort(-scores)[:top_k]
+        return [(names[i], float(scores[i])) for i in order]
+
+    def sync_tags(self, mic_tags):
+        """Make sure every MicTag has cached features"""
+        for tag in mic_tags:
+            audio_path = getattr(tag, 'audio_path', None)
+            if audio_path and os.path.exists(audio_path):
+                try:
+                    self.features(audio_path)
+                except Exception as e:
+                    print(f"[MicFeatureCache] Error computing features for {tag.name}: {e}")
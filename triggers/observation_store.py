@@ -0,0 +1,243 @@
+import sqlite3
+import threading
+import time
+
+HOUR = 3600
+RAW_RETENTION = 7 * 86400  # Individual observations
+ROLLUP_RETENTION = 180 * 86400  # Hourly per-identifier aggregates
+WINDOW_MERGE_SECONDS = 600  # Tag windows closer than this are merged into one
+MAX_INTERVAL = 300  # A result set counts for at most this long without a keepalive (e.g. the machine slept)
+KEEPALIVE_INTERVAL = 60  # How often callers should confirm that a sensor is still running
+PRUNE_INTERVAL = HOUR
+SCHEMA_VERSION = 2  # 1 counted result events and keyed windows by tag name only
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS identifiers (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    UNIQUE (kind, identifier)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    ts INTEGER NOT NULL,
+    ident INTEGER NOT NULL,
+    signal INTEGER
+);
+CREATE INDEX IF NOT EXISTS observations_ts ON observations (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    hour INTEGER NOT NULL,
+    ident INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    signal_sum REAL NOT NULL,
+    signal_seconds REAL NOT NULL,
+    PRIMARY KEY (hour, ident)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS scans (
+    hour INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (hour, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tag_windows (
+    tag_type TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tag_windows_tag ON tag_windows (tag_type, tag, end);
+"""
+
+
+def _hour_spans(start, end):
+    """Split [start, end) into (hour, seconds) pieces on hour boundaries"""
+    while start < end:
+        hour = int(start) // HOUR * HOUR
+        stop = min(end, hour + HOUR)
+        yield hour, stop - start
+        start = stop
+
+
+class ObservationStore:
+    """Local time series of Wi-Fi/Bluetooth observations in SQLite
+
+    Scanners only report when their results change, so presence is
+    measured in time rather than in reports: each result set counts for
+    the seconds until the next one arrives. While a sensor keeps running
+    with unchanged results, keepalive() should be called about every
+    KEEPALIVE_INTERVAL seconds; only the time since the last record or
+    keepalive is capped at max_interval, so a stable set counts in full
+    while a suspended machine doesn't. record()
+    writes raw rows for the new set (kept for raw_retention) and adds the
+    previous set's duration to hourly per-identifier rollups and per-kind
+    scan totals (kept for rollup_retention), so long-term queries never
+    touch raw data. Tags are tied to time windows with label(), which
+    should only be called for tags the user confirmed, normally with the
+    window the confirmed results were accumulated over (active_since() to
+    now); usually_seen() then
+    answers "which networks are usually around when this tag is active",
+    and fingerprint() scores tags against a fresh scan without any
+    geolocation lookup.
+    """
+
+    def __init__(self, db_file, raw_retention=RAW_RETENTION, rollup_retention=ROLLUP_RETENTION,
+                 max_interval=MAX_INTERVAL):
+        self.db_file = db_file
+        self.raw_retention = raw_retention
+        self.rollup_retention = rollup_retention
+        self.max_interval = max_interval
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # Event counts and name-only windows can't be converted; start these tables over
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS rollups; DROP TABLE IF EXISTS scans; DROP TABLE IF EXISTS tag_windows;")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+        self._ids = {}  # (kind, identifier) -> row id
+        self._current = {}  # kind -> (time, [(row id, signal)]) of the result set in effect
+        self._since = {}  # kind -> when its sensor started reporting without interruption
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+
+    def close(self, now=None):
+        """Account for the result sets still in effect and close the database"""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            for kind in list(self._current):
+                self._end(kind, now)
+        with self._lock:
+            self._conn.close()
+
+    def _ident(self, kind, identifier):
+        key = (kind, identifier)
+        ident = self._ids.get(key)
+        if ident is None:
+            self._conn.execute("INSERT OR IGNORE INTO identifiers (kind, identifier) VALUES (?, ?)", key)
+            ident = self._conn.execute("SELECT id FROM identifiers WHERE kind = ? AND identifier = ?",
+                                       key).fetchone()[0]
+            self._ids[key] = ident
+        return ident
+
+    def _end(self, kind, now):
+        """Add the duration of kind's current result set to the rollups"""
+        current = self._current.pop(kind, None)
+        if current is None:
+            return
+        start, rows = current
+        end = min(now, start + self.max_interval)
+        for hour, seconds in _hour_spans(start, end):
+            self._conn.executemany(
+                "INSERT INTO rollups (hour, ident, seconds, signal_sum, signal_seconds) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (hour, ident) DO UPDATE SET seconds = seconds + excluded.seconds, "
+                "signal_sum = signal_sum + excluded.signal_sum, "
+                "signal_seconds = signal_seconds + excluded.signal_seconds",
+                [(hour, ident, seconds, (signal or 0) * seconds, seconds if signal is not None else 0.0)
+                 for ident, signal in rows])
+            self._conn.execute(
+                "INSERT INTO scans (hour, kind, seconds) VALUES (?, ?, ?) "
+                "ON CONFLICT (hour, kind) DO UPDATE SET seconds = seconds + excluded.seconds",
+                (hour, kind, seconds))
+
+    def record(self, kind, observations, now=None):
+        """Store one scan: observations is a list of (identifier, signal or None)
+
+        The scan replaces kind's current result set; repeating an unchanged
+        scan is allowed but not needed, since time is what counts.
+        """
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            rows = [(self._ident(kind, identifier), signal) for identifier, signal in observations]
+            self._conn.executemany("INSERT INTO observations (ts, ident, signal) VALUES (?, ?, ?)",
+                                   [(int(now), ident, signal) for ident, signal in rows])
+            if kind not in self._current:
+                self._since[kind] = now
+            self._end(kind, now)
+            self._current[kind] = (now, rows)
+        if now - self._last_prune > PRUNE_INTERVAL:
+            self.prune(now)
+
+    def keepalive(self, kind, now=None):
+        """The sensor for kind is still running and its results haven't changed"""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            current = self._current.get(kind)
+            if current is None:
+                return
+            self._end(kind, now)
+            self._current[kind] = (now, current[1])
+
+    def end(self, kind, now=None):
+        """The sensor for kind stopped; its last result set is no longer in effect"""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._end(kind, now)
+            self._since.pop(kind, None)
+
+    def active_since(self, kind=None):
+        """When kind's sensor (or, without kind, the longest-running sensor) started reporting; None if none is"""
+        with self._lock:
+            if kind is not None:
+                return self._since.get(kind)
+            return min(self._since.values(), default=None)
+
+    def label(self, tag_type, tag, start, end=None):
+        """Mark [start, end] as a time when a confirmed tag was active, extending a recent window if possible"""
+        end = start if end is None else end
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT rowid, end FROM tag_windows WHERE tag_type = ? AND tag = ? ORDER BY end DESC LIMIT 1",
+                (tag_type, tag)).fetchone()
+            if row and start - row[1] <= WINDOW_MERGE_SECONDS:
+                self._conn.execute("UPDATE tag_windows SET end = MAX(end, ?) WHERE rowid = ?", (int(end), row[0]))
+            else:
+                self._conn.execute("INSERT INTO tag_windows (tag_type, tag, start, end) VALUES (?, ?, ?, ?)",
+                                   (tag_type, tag, int(start), int(end)))
+
+    def usually_seen(self, tag_type, tag, kind, min_fraction=0.5):
+        """Identifiers present for at least min_fraction of kind's scanned time during a tag's windows
+
+        Returns [(identifier, fraction of time, mean signal or None)], most present first.
+        """
+        with self._lock:
+            hours = [h for (h,) in self._conn.execute(
+                "SELECT DISTINCT s.hour FROM scans s JOIN tag_windows w ON w.tag_type = ? AND w.tag = ? "
+                "AND s.hour <= w.end AND s.hour + ? > w.start WHERE s.kind = ?", (tag_type, tag, HOUR, kind))]
+            if not hours:
+                return []
+            marks = ",".join("?" * len(hours))
+            total = self._conn.execute(
+                f"SELECT SUM(seconds) FROM scans WHERE kind = ? AND hour IN ({marks})", [kind] + hours).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT i.identifier, SUM(r.seconds), SUM(r.signal_sum), SUM(r.signal_seconds) "
+                f"FROM rollups r JOIN identifiers i ON i.id = r.ident "
+                f"WHERE i.kind = ? AND r.hour IN ({marks}) GROUP BY r.ident", [kind] + hours).fetchall()
+        if not total:
+            return []
+        results = [(identifier, seconds / total, signal_sum / signal_seconds if signal_seconds else None)
+                   for identifier, seconds, signal_sum, signal_seconds in rows]
+        return sorted((r for r in results if r[1] >= min_fraction), key=lambda r: -r[1])
+
+    def fingerprint(self, kind, observed, tags, min_fraction=0.5):
+        """Score (tag_type, name) tags against a scan by overlap with their usual identifiers
+
+        Returns [((tag_type, name), score)], best first.
+        """
+        observed = set(observed)
+        scores = []
+        for tag_type, tag in tags:
+            usual = {identifier for identifier, _, _ in self.usually_seen(tag_type, tag, kind, min_fraction)}
+            if usual:
+                scores.append(((tag_type, tag), len(usual & observed) / len(usual | observed)))
+        return sorted((s for s in scores if s[1] > 0), key=lambda s: -s[1])
+
+    def prune(self, now=None):
+        """Apply retention: drop old raw observations, rollups and scan counts"""
+        now = time.time() if now is None else now
+        self._last_prune = now
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM observations WHERE ts < ?", (int(now - self.raw_retention),))
+            cutoff = int(now - self.rollup_retention)
+            self._conn.execute("DELETE FROM rollups WHERE hour < ?", (cutoff,))
+            self._conn.execute("DELETE FROM scans WHERE hour < ?", (cutoff,))
+            self._conn.execute("DELETE FROM tag_windows WHERE end < ?", (cutoff,))
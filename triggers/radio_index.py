@@ -0,0 +1,141 @@
+from collections import defaultdict
+import re
+import threading
+
+WIFI = "Wifi"
+BLUETOOTH = "Bluetooth"
+
+# Display strings stored by older tags: "SSID (73%)" and "Name (AA:BB:CC:DD:EE:FF)"
+_LEGACY_WIFI = re.compile(r"^(?P<ssid>.*) \(\d+%\)$")
+_LEGACY_BLUETOOTH = re.compile(r"\((?P<mac>(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2})\)$")
+_MAC = re.compile(r"^(?:[0-9a-f]{2}:){5}[0-9a-f]{2}$")
+
+
+def normalize_mac(address):
+    return address.strip().lower().replace("-", ":")
+
+
+def wifi_identifier(network):
+    """Normalized identifier for a scanned network (dict) or a legacy display string"""
+    if isinstance(network, dict):
+        if network.get('bssid'):
+            return f"bssid:{normalize_mac(network['bssid'])}"
+        return f"ssid:{network.get('ssid', '')}"
+    text = str(network)
+    if text.startswith(("bssid:", "ssid:")):
+        return text
+    match = _LEGACY_WIFI.match(text)
+    return f"ssid:{match.group('ssid') if match else text}"
+
+
+def wifi_observed_ids(network):
+    """Every identifier a scanned network can match: its BSSID and its SSID"""
+    ids = {wifi_identifier(network)}
+    if isinstance(network, dict) and network.get('ssid'):
+        ids.add(f"ssid:{network['ssid']}")
+    return ids
+
+
+def bluetooth_identifier(device):
+    """Normalized identifier for a scanned (address, name) pair or a legacy display string"""
+    if isinstance(device, (tuple, list)):
+        return f"mac:{normalize_mac(device[0])}"
+    text = str(device)
+    if text.startswith("mac:"):
+        return text
+    match = _LEGACY_BLUETOOTH.search(text)
+    if match:
+        return f"mac:{normalize_mac(match.group('mac'))}"
+    if _MAC.match(normalize_mac(text)):
+        return f"mac:{normalize_mac(text)}"
+    return f"name:{text}"
+
+
+def bluetooth_observed_ids(device):
+    """Every identifier a scanned device can match: its address and its name"""
+    ids = {bluetooth_identifier(device)}
+    if isinstance(device, (tuple, list)) and len(device) > 1 and device[1]:
+        ids.add(f"name:{device[1]}")
+    return ids
+
+
+# The constructor argument each tag type stores its networks/devices under
+TAG_FIELDS = {WIFI: "networks", BLUETOOTH: "devices"}
+
+
+def tag_entries(tag, field):
+    """The network/device list a WiFiTag or BluetoothTag keeps in field"""
+    entries = getattr(tag, field, None)
+    if entries is None:
+        data = tag.to_dict() if hasattr(tag, 'to_dict') else dict(tag)
+        entries = data.get(field)
+    return list(entries or [])
+
+
+class RadioTagIndex:
+    """Inverted index from normalized Wi-Fi/Bluetooth identifier to tag names
+
+    Each scan resolves to tags by looking up only the observed
+    identifiers, so matching costs O(observed devices) no matter how many
+    tags exist. match() reports, per tag, the fraction of its identifiers
+    that were seen.
+    """
+
+    def __init__(self, identifier, observed_ids, field):
+        self.identifier = identifier  # Normalizes one stored tag entry
+        self.observed_ids = observed_ids  # All identifiers one scan result can match
+        self.field = field  # Tag field holding the entries
+        self._index = defaultdict(set)  # identifier -> tag names
+        self._tag_ids = {}  # tag name -> frozenset of identifiers
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tag_ids)
+
+    def set_tag(self, name, entries):
+        ids = frozenset(self.identifier(e) for e in entries)
+        with self._lock:
+            self._remove(name)
+            self._tag_ids[name] = ids
+            for identifier in ids:
+                self._index[identifier].add(name)
+
+    def _remove(self, name):
+        for identifier in self._tag_ids.pop(name, ()):
+            names = self._index[identifier]
+            names.discard(name)
+            if not names:
+                del self._index[identifier]
+
+    def remove_tag(self, name):
+        with self._lock:
+            self._remove(name)
+
+    def sync_tags(self, tags):
+        """Rebuild entries for tags whose identifiers changed and drop deleted ones"""
+        names = set()
+        for tag in tags:
+            names.add(tag.name)
+            ids = frozenset(self.identifier(e) for e in tag_entries(tag, self.field))
+            if self._tag_ids.get(tag.name) != ids:
+                self.set_tag(tag.name, ids)
+        for name in [n for n in self._tag_ids if n not in names]:
+            self.remove_tag(name)
+
+    def match(self, observed, min_fraction=0.0):
+        """Tags seen in a scan, best first, as (name, fraction of the tag's identifiers seen)"""
+        seen = set().union(*(self.observed_ids(e) for e in observed))
+        hits = defaultdict(int)
+        with self._lock:
+            for identifier in seen:
+                for name in self._index.get(identifier, ()):
+                    hits[name] += 1
+            scores = [(name, count / len(self._tag_ids[name])) for name, count in hits.items()]
+        return sorted((s for s in scores if s[1] >= min_fraction), key=lambda s: -s[1])
+
+
+def radio_index(trigger_type):
+    """An empty index for "Wifi" or "Bluetooth" tags"""
+    if trigger_type == WIFI:
+        return RadioTagIndex(wifi_identifier, wifi_observed_ids, TAG_FIELDS[WIFI])
+    return RadioTagIndex(bluetooth_identifier, bluetooth_observed_ids, TAG_FIELDS[BLUETOOTH])
@@ -0,0 +1,123 @@
+import threading
+import numpy as np
+
+NEAR_DBM = -70.0  # Smoothed RSSI at or above this makes a device "nearby"
+FAR_DBM = -80.0  # ...and it stays nearby until it drops below this
+PROCESS_NOISE = 4.0  # dB^2 per second the true RSSI is allowed to drift
+MEASUREMENT_NOISE = 36.0  # dB^2; single advertisements routinely jump by +-6 dB
+LOST_SECONDS = 30.0  # No reports for this long counts as gone
+FORGET_SECONDS = 300.0  # ...and after this long its filter slot is freed for other devices
+
+
+class ProximityFilter:
+    """Per-device Kalman-filtered RSSI with hysteresis on the "nearby" state
+
+    Filter state for every device lives in a few parallel numpy arrays
+    (estimate, variance, last report time, nearby flag) indexed by a slot
+    per address, grown by doubling. A device becomes nearby when its
+    smoothed RSSI reaches near_dbm and only stops being nearby below
+    far_dbm (or after lost_seconds of silence), so a phone sitting at the
+    edge of the range doesn't flap the match on and off. expire() frees
+    the slots of devices silent for forget_seconds by compacting the
+    arrays, so passers-by don't accumulate over a long scan.
+    """
+
+    def __init__(self, near_dbm=NEAR_DBM, far_dbm=FAR_DBM, process_noise=PROCESS_NOISE,
+                 measurement_noise=MEASUREMENT_NOISE, lost_seconds=LOST_SECONDS,
+                 forget_seconds=FORGET_SECONDS, capacity=32):
+        self.near_dbm = near_dbm
+        self.far_dbm = far_dbm
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.lost_seconds = lost_seconds
+        self.forget_seconds = max(forget_seconds, lost_seconds)
+        self._slots = {}  # address -> index into the arrays
+        self._addresses = []
+        self._estimate = np.zeros(capacity, dtype=np.float32)
+        self._variance = np.zeros(capacity, dtype=np.float32)
+        self._last_seen = np.zeros(capacity, dtype=np.float64)
+        self._near = np.zeros(capacity, dtype=bool)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _slot(self, address):
+        slot = self._slots.get(address)
+        if slot is None:
+            slot = len(self._addresses)
+            if slot == len(self._estimate):
+                capacity = 2 * len(self._estimate)
+                self._estimate = np.resize(self._estimate, capacity)
+                self._variance = np.resize(self._variance, capacity)
+                self._last_seen = np.resize(self._last_seen, capacity)
+                self._near = np.resize(self._near, capacity)
+            self._slots[address] = slot
+            self._addresses.append(address)
+            self._variance[slot] = -1.0  # No estimate yet
+            self._near[slot] = False
+        return slot
+
+    def update(self, address, rssi, now):
+        """Feed one RSSI report; returns the new nearby state if it changed, else None"""
+        with self._lock:
+            slot = self._slot(address)
+            if self._variance[slot] < 0:
+                self._estimate[slot] = rssi
+                self._variance[slot] = self.measurement_noise
+            else:
+                dt = max(0.0, now - self._last_seen[slot])
+                prior = self._variance[slot] + self.process_noise * dt
+                gain = prior / (prior + self.measurement_noise)
+                self._estimate[slot] += gain * (rssi - self._estimate[slot])
+                self._variance[slot] = (1.0 - gain) * prior
+            self._last_seen[slot] = now
+
+            near = self._near[slot]
+            estimate = self._estimate[slot]
+            if not near and estimate >= self.near_dbm:
+                self._near[slot] = True
+                return True
+            if near and estimate < self.far_dbm:
+                self._near[slot] = False
+                return False
+            return None
+
+    def expire(self, now):
+        """Clear the nearby flag of devices that went silent and forget long-gone ones
+
+        Returns the addresses that stopped being nearby.
+        """
+        with self._lock:
+            count = len(self._addresses)
+            silent = now - self._last_seen[:count]
+            indices = np.flatnonzero(self._near[:count] & (silent > self.lost_seconds))
+            self._near[indices] = False
+            self._variance[indices] = -1.0  # Start fresh when it comes back
+            lost = [self._addresses[i] for i in indices]
+            stale = silent > self.forget_seconds
+            if stale.any():
+                self._compact(np.flatnonzero(~stale))
+            return lost
+
+    def _compact(self, keep):
+        """Keep only the given slots, moved to the front of the arrays in order"""
+        n = len(keep)
+        for array in (self._estimate, self._variance, self._last_seen, self._near):
+            array[:n] = array[keep]
+        self._addresses = [self._addresses[i] for i in keep]
+        self._slots = {address: slot for slot, address in enumerate(self._addresses)}
+
+    def smoothed(self, address):
+        slot = self._slots.get(address)
+        if slot is None or self._variance[slot] < 0:
+            return None
+        return float(self._estimate[slot])
+
+    def is_near(self, address):
+        slot = self._slots.get(address)
+        return slot is not None and bool(self._near[slot])
+
+    def near_devices(self):
+        with self._lock:
+            return [self._addresses[i] for i in np.flatnonzero(self._near[:len(self._addresses)])]
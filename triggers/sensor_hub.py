@@ -0,0 +1,173 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+import hashlib
+import json
+import threading
+
+_hub = None
+
+
+def results_hash(results):
+    return hashlib.sha1(json.dumps(results, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class PolledSensor:
+    """Runs a blocking scan function on its own thread with an adaptive interval
+
+    The interval starts at min_interval and is multiplied by backoff each
+    time a scan returns the same results as the previous one, up to
+    max_interval; any change drops it back to min_interval.
+    """
+
+    def __init__(self, scan, min_interval=5.0, max_interval=60.0, backoff=1.5):
+        self.scan = scan
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._on_results = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self, on_results):
+        self._on_results = on_results
+        self._stop.clear()
+        self.interval = self.min_interval
+        self._thread = threading.Thread(target=self._run, name="PolledSensor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def scan_now(self):
+        self._wake.set()
+
+    def _run(self):
+        last = None
+        while not self._stop.is_set():
+            try:
+                results = self.scan()
+            except Exception as e:
+                print(f"[SensorHub] Scan failed: {e}")
+                results = None
+            if results is not None:
+                digest = results_hash(results)
+                if digest == last:
+                    self.interval = min(self.interval * self.backoff, self.max_interval)
+                else:
+                    self.interval = self.min_interval
+                    last = digest
+                self._on_results(results)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+class ThreadSensor:
+    """Adapts an existing scanner QThread (start/stop/wait plus a results signal)"""
+
+    def __init__(self, scanner, signal):
+        self.scanner = scanner
+        self.signal = signal
+        self._on_results = None
+
+    def start(self, on_results):
+        self._on_results = on_results
+        self.signal.connect(on_results)
+        self.scanner.start()
+
+    def stop(self):
+        self.signal.disconnect(self._on_results)
+        if self.scanner.isRunning():
+            self.scanner.stop()
+            self.scanner.wait()
+
+    def scan_now(self):
+        pass  # The scanner thread keeps its own schedule
+
+
+def get_sensor_hub():
+    """Return the shared hub so the UI and the background monitor scan each radio once"""
+    global _hub
+    if _hub is None:
+        _hub = SensorHub()
+    return _hub
+
+
+class SensorHub(QObject):
+    """Owns every scanner and fans its results out to all consumers
+
+    Consumers acquire() a sensor while they need it and release() it
+    afterwards; a sensor runs only while at least one consumer holds it.
+    results_updated is emitted only when a sensor's results differ from
+    its previous ones, and latest() returns the last results for
+    consumers that join mid-scan.
+    """
+    results_updated = pyqtSignal(str, list)  # sensor name, results
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sensors = {}  # name -> sensor
+        self._holders = {}  # name -> set of consumer ids
+        self._latest = {}  # name -> results
+        self._hashes = {}  # name -> hash of the latest results
+        self._lock = threading.Lock()
+
+    def add_sensor(self, name, sensor):
+        if name in self._sensors:
+            return self._sensors[name]
+        self._sensors[name] = sensor
+        self._holders[name] = set()
+        return sensor
+
+    def acquire(self, name, consumer):
+        """Hold a sensor for consumer, starting it if it was idle"""
+        holders = self._holders[name]
+        if id(consumer) in holders:
+            return
+        holders.add(id(consumer))
+        if len(holders) == 1:
+            self._sensors[name].start(lambda results, name=name: self._publish(name, results))
+            print(f"[SensorHub] Started {name}")
+        elif name in self._latest:
+            self.results_updated.emit(name, self._latest[name])
+
+    def release(self, name, consumer):
+        """Drop consumer's hold; the sensor stops when nobody holds it"""
+        holders = self._holders.get(name)
+        if not holders or id(consumer) not in holders:
+            return
+        holders.discard(id(consumer))
+        if not holders:
+            self._sensors[name].stop()
+            with self._lock:
+                self._hashes.pop(name, None)  # A fresh start should always publish
+                self._latest.pop(name, None)
+            print(f"[SensorHub] Stopped {name}")
+
+    def release_all(self, consumer):
+        for name in list(self._holders):
+            self.release(name, consumer)
+
+    def is_held(self, name, consumer=None):
+        holders = self._holders.get(name, ())
+        return id(consumer) in holders if consumer is not None else bool(holders)
+
+    def scan_now(self, name):
+        self._sensors[name].scan_now()
+
+    def latest(self, name):
+        return self._latest.get(name, [])
+
+    def _publish(self, name, results):
+        results = list(results)
+        digest = results_hash(results)
+        with self._lock:
+            if self._hashes.get(name) == digest:
+                return
+            self._hashes[name] = digest
+            self._latest[name] = results
+        self.results_updated.emit(name, results)
@@ -0,0 +1,76 @@
+import numpy as np
+from triggers.audio_fingerprint import to_mono_float
+
+DEFAULT_ENERGY_THRESHOLD_DB = -45.0
+DEFAULT_ZCR_THRESHOLD = 0.25
+
+
+class VoiceActivityDetector:
+    """Energy + zero-crossing voice activity detection over fixed frames
+
+    A frame is active when its energy is above energy_threshold_db, or when
+    it is within 10 dB of it and has a high zero-crossing rate (unvoiced
+    sounds such as "s" and "f"). Active frames are merged into regions,
+    bridging gaps shorter than min_gap and dropping blips shorter than
+    min_duration. Everything is computed with whole-array numpy operations.
+    """
+
+    def __init__(self, energy_threshold_db=DEFAULT_ENERGY_THRESHOLD_DB,
+                 zcr_threshold=DEFAULT_ZCR_THRESHOLD, frame_ms=20, min_gap=0.3, min_duration=0.1):
+        self.energy_threshold_db = energy_threshold_db
+        self.zcr_threshold = zcr_threshold
+        self.frame_ms = frame_ms
+        self.min_gap = min_gap
+        self.min_duration = min_duration
+
+    def frame_features(self, samples, sample_rate):
+        """Per-frame energy (dBFS) and zero-crossing rate"""
+        mono = to_mono_float(samples)
+        frame_len = max(1, int(sample_rate * self.frame_ms / 1000))
+        n_frames = len(mono) // frame_len
+        if not n_frames:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32), frame_len
+        frames = mono[:n_frames * frame_len].reshape(n_frames, frame_len)
+        energy = np.einsum("ij,ij->i", frames, frames) / frame_len
+        energy_db = 10.0 * np.log10(energy + 1e-12)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1 or 1)
+        return energy_db.astype(np.float32), zcr.astype(np.float32), frame_len
+
+    def active_frames(self, samples, sample_rate):
+        energy_db, zcr, frame_len = self.frame_features(samples, sample_rate)
+        voiced = energy_db > self.energy_threshold_db
+        unvoiced = (energy_db > self.energy_threshold_db - 10.0) & (zcr > self.zcr_threshold)
+        return voiced | unvoiced, frame_len
+
+    def segments(self, samples, sample_rate):
+        """Active regions as a list of (start_sample, end_sample)"""
+        active, frame_len = self.active_frames(samples, sample_rate)
+        if not active.any():
+            return []
+        edges = np.diff(np.concatenate([[0], active.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        # Bridge short pauses, then drop short blips
+        min_gap = int(self.min_gap * 1000 / self.frame_ms)
+        keep = np.concatenate([[True], starts[1:] - ends[:-1] > min_gap])
+        ends = np.maximum.reduceat(ends, np.flatnonzero(keep))
+        starts = starts[keep]
+        min_frames = int(self.min_duration * 1000 / self.frame_ms)
+        long_enough = ends - starts >= max(1, min_frames)
+        return [(int(s) * frame_len, int(e) * frame_len)
+                for s, e in zip(starts[long_enough], ends[long_enough])]
+
+    def is_active(self, samples, sample_rate):
+        """Cheap check used to skip matching on silent windows"""
+        active, _ = self.active_frames(samples, sample_rate)
+        return bool(active.any())
+
+    def active_audio(self, samples, sample_rate):
+        """Concatenation of the active regions (empty if the clip is silent)"""
+        samples = np.asarray(samples)
+        regions = self.segments(samples, sample_rate)
+        if not regions:
+            return samples[:0]
+        return np.concatenate([samples[s:e] for s, e in regions])
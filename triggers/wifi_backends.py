@@ -0,0 +1,197 @@
+from abc import ABC, abstractmethod
+import subprocess
+import threading
+import time
+from triggers.dbus_values import plain_value
+
+try:
+    from PyQt5.QtDBus import QDBusConnection, QDBusMessage
+except ImportError:  # QtDBus isn't built on every platform (e.g. Windows wheels)
+    QDBusConnection = None
+
+NM_SERVICE = "org.freedesktop.NetworkManager"
+NM_PATH = "/org/freedesktop/NetworkManager"
+NM_IFACE = "org.freedesktop.NetworkManager"
+NM_WIRELESS_IFACE = "org.freedesktop.NetworkManager.Device.Wireless"
+NM_DEVICE_IFACE = "org.freedesktop.NetworkManager.Device"
+NM_AP_IFACE = "org.freedesktop.NetworkManager.AccessPoint"
+PROPERTIES = "org.freedesktop.DBus.Properties"
+NM_DEVICE_TYPE_WIFI = 2
+
+CACHE_SECONDS = 2.0  # Scans requested more often than this reuse the previous results
+RESCAN_SECONDS = 30.0  # Ask NetworkManager for a fresh radio scan when its list is older than this
+
+
+def _decode_ssid(raw):
+    if isinstance(raw, str):
+        return raw
+    return bytes(raw).decode("utf-8", errors="replace")
+
+
+class WifiBackend(ABC):
+    """Source of Wi-Fi scan results as [{'ssid', 'bssid', 'signal', 'frequency'}]
+
+    scan() returns results no older than max_age seconds, reusing the
+    previous results when they are fresh enough.
+    """
+    name = "base"
+
+    def __init__(self, cache_seconds=CACHE_SECONDS):
+        self.cache_seconds = cache_seconds
+        self._cached = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+
+    def scan(self, max_age=None):
+        max_age = self.cache_seconds if max_age is None else max_age
+        with self._lock:
+            now = time.monotonic()
+            if self._cached is None or now - self._cached_at > max_age:
+                self._cached = self._scan()
+                self._cached_at = now
+            return list(self._cached)
+
+    @abstractmethod
+    def _scan(self):
+        """Read fresh results from the source"""
+
+
+class NetworkManagerBackend(WifiBackend):
+    """Reads NetworkManager's access point list over D-Bus; no processes are spawned
+
+    NetworkManager already scans in the background, so most calls just read
+    its current list; a radio rescan is requested only when that list is
+    older than rescan_seconds. Safe to call from worker threads.
+    """
+    name = "networkmanager"
+
+    def __init__(self, connection=None, cache_seconds=CACHE_SECONDS, rescan_seconds=RESCAN_SECONDS):
+        super().__init__(cache_seconds)
+        if QDBusConnection is None:
+            raise RuntimeError("QtDBus is not available")
+        self.connection = connection if connection is not None else QDBusConnection.systemBus()
+        self.rescan_seconds = rescan_seconds
+        self._devices = None
+
+    @staticmethod
+    def available(connection=None):
+        if QDBusConnection is None:
+            return False
+        connection = connection if connection is not None else QDBusConnection.systemBus()
+        if not connection.isConnected():
+            return False
+        reply = connection.interface().isServiceRegistered(NM_SERVICE)
+        return reply.isValid() and bool(reply.value())
+
+    def _call(self, path, interface, method, *args):
+        message = QDBusMessage.createMethodCall(NM_SERVICE, path, interface, method)
+        if args:
+            message.setArguments(list(args))
+        reply = self.connection.call(message)
+        if reply.type() == QDBusMessage.ErrorMessage:
+            raise RuntimeError(reply.errorMessage())
+        return [plain_value(a) for a in reply.arguments()]
+
+    def _property(self, path, interface, name):
+        return self._call(path, PROPERTIES, "Get", interface, name)[0]
+
+    def wifi_devices(self):
+        if self._devices is None:
+            devices = self._call(NM_PATH, NM_IFACE, "GetDevices")[0]
+            self._devices = [d for d in devices
+                             if self._property(d, NM_DEVICE_IFACE, "DeviceType") == NM_DEVICE_TYPE_WIFI]
+        return self._devices
+
+    def _scan(self):
+        networks = []
+        for device in self.wifi_devices():
+            self._request_rescan_if_stale(device)
+            for ap in self._call(device, NM_WIRELESS_IFACE, "GetAllAccessPoints")[0]:
+                props = self._call(ap, PROPERTIES, "GetAll", NM_AP_IFACE)[0]
+                networks.append({
+                    'ssid': _decode_ssid(props.get("Ssid", b"")),
+                    'bssid': str(props.get("HwAddress", "")).lower(),
+                    'signal': int(props.get("Strength", 0)),
+                    'frequency': int(props.get("Frequency", 0)),
+                })
+        return networks
+
+    def _request_rescan_if_stale(self, device):
+        try:
+            last_scan = self._property(device, NM_WIRELESS_IFACE, "LastScan")  # ms of CLOCK_BOOTTIME
+            if last_scan >= 0 and time.clock_gettime(time.CLOCK_BOOTTIME) * 1000 - last_scan < self.rescan_seconds * 1000:
+                return
+            # The new results show up in the access point list on a later call
+            self._call(device, NM_WIRELESS_IFACE, "RequestScan", {})
+        except RuntimeError as e:
+            print(f"[NetworkManagerBackend] Rescan not requested: {e}")
+
+
+class NmcliBackend(WifiBackend):
+    """Spawns nmcli for every scan; kept as the fallback and for benchmarking"""
+    name = "nmcli"
+
+    def _scan(self):
+        output = subprocess.run(
+            ["nmcli", "-t", "-e", "yes", "-f", "SSID,BSSID,SIGNAL,FREQ", "device", "wifi", "list", "--rescan", "no"],
+            capture_output=True, text=True, timeout=10, check=True).stdout
+        networks = []
+        for line in output.splitlines():
+            # Terse output escapes ':' inside fields as '\:'
+            fields = [f.replace("\x00", ":") for f in line.replace("\\:", "\x00").split(":")]
+            if len(fields) < 4:
+                continue
+            networks.append({
+                'ssid': fields[0],
+                'bssid': fields[1].lower(),
+                'signal': int(fields[2] or 0),
+                'frequency': int(fields[3].split()[0] or 0),
+            })
+        return networks
+
+
+class FakeWifiBackend(WifiBackend):
+    """Returns canned results; pass a list, or a callable returning one per scan"""
+    name = "fake"
+
+    def __init__(self, networks, cache_seconds=0.0):
+        super().__init__(cache_seconds)
+        self.networks = networks
+        self.scans = 0
+
+    def _scan(self):
+        self.scans += 1
+        return list(self.networks() if callable(self.networks) else self.networks)
+
+
+def default_backend():
+    """NetworkManager over D-Bus when it's running, otherwise nmcli"""
+    if NetworkManagerBackend.available():
+        return NetworkManagerBackend()
+    return NmcliBackend()
+
+
+def benchmark(backends, rounds=50, max_age=0.0):
+    """Average seconds per scan for each backend, bypassing the result cache"""
+    timings = {}
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            backend.scan(max_age=max_age)
+        timings[backend.name] = (time.perf_counter() - start) / rounds
+    return timings
+
+
+if __name__ == "__main__":
+    from PyQt5.QtCore import QCoreApplication
+    app = QCoreApplication([])
+    candidates = [FakeWifiBackend([{'ssid': "bench", 'bssid': "00:00:00:00:00:00", 'signal': 50, 'frequency': 2412}])]
+    if NetworkManagerBackend.available():
+        candidates.append(NetworkManagerBackend())
+    try:
+        subprocess.run(["nmcli", "--version"], capture_output=True, check=True)
+        candidates.append(NmcliBackend())
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    for name, seconds in benchmark(candidates).items():
+        print(f"{name:>16}: {seconds * 1000:.2f} ms/scan")
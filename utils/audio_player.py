@@ -0,0 +1,126 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+import threading
+import numpy as np
+import scipy.io.wavfile as wav
+import sounddevice as sd
+
+
+def _block_to_float32(block):
+    """Convert one block of PCM samples to float32 in -1.0 - 1.0"""
+    if block.dtype == np.float32:
+        return block
+    if block.dtype == np.uint8:
+        return (block.astype(np.float32) - 128.0) / 128.0
+    if block.dtype.kind == "i":
+        return block.astype(np.float32) / float(-np.iinfo(block.dtype).min)
+    return block.astype(np.float32)
+
+
+class AudioPlayer(QObject):
+    """Non-blocking WAV playback for previewing recordings
+
+    The file is memory-mapped and an OutputStream callback pulls one block
+    at a time from it, converting only that block to float32, so playback
+    never loads the whole file and never blocks the GUI thread. Each
+    stream is tagged with a generation number, so the end of a stream that
+    was stopped or replaced can't end the playback that replaced it.
+    """
+    playback_started = pyqtSignal()
+    playback_finished = pyqtSignal()
+    playback_error = pyqtSignal(str)
+    _stream_finished = pyqtSignal(int)  # generation; queued from the audio thread to this object's thread
+
+    def __init__(self, parent=None, blocksize=2048):
+        super().__init__(parent)
+        self.blocksize = blocksize
+        self._stream = None
+        self._data = None
+        self._sample_rate = 0
+        self._position = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stream_finished.connect(self._on_stream_finished)
+
+    def is_playing(self):
+        return self._stream is not None and self._stream.active
+
+    def duration(self):
+        return len(self._data) / self._sample_rate if self._data is not None else 0.0
+
+    def position(self):
+        with self._lock:
+            return self._position / self._sample_rate if self._sample_rate else 0.0
+
+    def play(self, audio_path):
+        """Start playing a WAV file from the beginning, stopping any current playback"""
+        try:
+            try:
+                sample_rate, data = wav.read(audio_path, mmap=True)
+            except ValueError:
+                sample_rate, data = wav.read(audio_path)  # e.g. 24-bit files can't be mapped
+        except Exception as e:
+            self.playback_error.emit(f"Failed to play audio: {str(e)}")
+            return
+        self.play_buffer(data, sample_rate)
+
+    def play_buffer(self, data, sample_rate):
+        """Play samples already in memory (e.g. a take that hasn't been saved yet)"""
+        self._close_stream()
+        generation = self._generation
+        try:
+            data = np.asarray(data)
+            if data.ndim == 1:
+                data = data.reshape(-1, 1)
+            with self._lock:
+                self._data = data
+                self._sample_rate = sample_rate
+                self._position = 0
+            self._stream = sd.OutputStream(
+                samplerate=sample_rate,
+                channels=data.shape[1],
+                dtype="float32",
+                blocksize=self.blocksize,
+                callback=self._callback,
+                finished_callback=lambda: self._stream_finished.emit(generation),
+            )
+            self._stream.start()
+            self.playback_started.emit()
+        except Exception as e:
+            self._stream = None
+            self.playback_error.emit(f"Failed to play audio: {str(e)}")
+
+    def _callback(self, outdata, frames, time_info, status):
+        with self._lock:
+            start = self._position
+            block = self._data[start:start + frames]
+            self._position = start + len(block)
+        outdata[:len(block)] = _block_to_float32(block)
+        if len(block) < frames:
+            outdata[len(block):] = 0
+            raise sd.CallbackStop()
+
+    def seek(self, seconds):
+        """Jump to a position (in seconds) in the current file"""
+        with self._lock:
+            if self._data is None:
+                return
+            self._position = int(max(0.0, min(seconds, self.duration())) * self._sample_rate)
+
+    def _on_stream_finished(self, generation):
+        if generation != self._generation:
+            return  # A stream that was stopped or replaced; its end was handled then
+        self._close_stream()
+        self.playback_finished.emit()
+
+    def _close_stream(self):
+        self._generation += 1  # Anything the old stream reports from here on is stale
+        if self._stream is not None:
+            self._stream.abort()
+            self._stream.close()
+            self._stream = None
+
+    def stop(self):
+        playing = self._stream is not None
+        self._close_stream()
+        if playing:
+            self.playback_finished.emit()
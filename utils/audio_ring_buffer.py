@@ -0,0 +1,99 @@
+import threading
+import numpy as np
+
+MAX_PREROLL_SECONDS = 60  # Hard cap so a misconfigured category can't grab unbounded memory
+
+PREROLL_OPTIONS = {
+    "Off": 0,
+    "5 seconds": 5,
+    "10 seconds": 10,
+    "30 seconds": 30,
+}
+
+
+def preroll_seconds(settings):
+    """Pre-roll length configured in a category's audio_recording settings"""
+    value = (settings or {}).get("preroll", "Off")
+    seconds = PREROLL_OPTIONS.get(value, value if isinstance(value, (int, float)) else 0)
+    return max(0, min(float(seconds), MAX_PREROLL_SECONDS))
+
+
+class PreRollBuffer:
+    """Fixed-size ring buffer holding the last N seconds of audio while armed
+
+    Storage is allocated once; write() copies each incoming chunk into place
+    and never allocates. segments() returns the buffered audio as (at most)
+    two views in chronological order for callers that consume it under
+    their own control. When a trigger fires, flush() hands the writer one
+    copy of the buffered audio, so the ring can keep recording straight
+    away while the writer drains its queue. TriggeredRecorder feeds it from
+    the input stream callback while a category is armed.
+    """
+
+    def __init__(self, seconds, sample_rate, channels=1, dtype=np.float32):
+        seconds = max(0, min(seconds, MAX_PREROLL_SECONDS))
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.capacity = int(seconds * sample_rate)
+        self._buffer = np.zeros((self.capacity, channels), dtype=dtype)
+        self._write_pos = 0
+        self._filled = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self._buffer.nbytes
+
+    def __len__(self):
+        return self._filled
+
+    def write(self, chunk):
+        """Append a (frames,) or (frames, channels) chunk, overwriting the oldest audio"""
+        if not self.capacity:
+            return
+        chunk = np.asarray(chunk).reshape(-1, self.channels)
+        if len(chunk) > self.capacity:
+            chunk = chunk[-self.capacity:]
+        n = len(chunk)
+        with self._lock:
+            end = self._write_pos + n
+            if end <= self.capacity:
+                self._buffer[self._write_pos:end] = chunk
+            else:
+                split = self.capacity - self._write_pos
+                self._buffer[self._write_pos:] = chunk[:split]
+                self._buffer[:n - split] = chunk[split:]
+            self._write_pos = end % self.capacity
+            self._filled = min(self.capacity, self._filled + n)
+
+    def segments(self):
+        """Buffered audio, oldest first, as views into the ring (valid until the next write)"""
+        with self._lock:
+            return self._segments_locked()
+
+    def flush(self, write):
+        """Pass the buffered audio to write() as one array the ring no longer owns, then empty the buffer
+
+        This is the only copy the pre-roll makes on its way to disk: the
+        ring is reused straight away, and StreamingAudioWriter.write()
+        queues the array it is given as is, so write() owns it from here.
+        """
+        with self._lock:
+            segments = self._segments_locked()
+            audio = np.concatenate(segments) if len(segments) > 1 else segments[0].copy()
+            self._write_pos = 0
+            self._filled = 0
+        if len(audio):
+            write(audio)
+
+    def _segments_locked(self):
+        if self._filled < self.capacity:
+            return [self._buffer[:self._filled]]
+        if self._write_pos == 0:
+            return [self._buffer]
+        return [self._buffer[self._write_pos:], self._buffer[:self._write_pos]]
+
+    def clear(self):
+        with self._lock:
+            self._write_pos = 0
+            self._filled = 0
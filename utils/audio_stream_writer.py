@@ -0,0 +1,162 @@
+import os
+import queue
+import threading
+import wave
+import numpy as np
+
+try:
+    import soundfile as sf
+except ImportError:  # FLAC/Opus need libsndfile; WAV always works
+    sf = None
+
+_STOP = object()
+
+
+def available_formats():
+    """Output formats usable on this machine; WAV (always available) first, as the default"""
+    formats = ["wav"]
+    if sf is not None:
+        supported = sf.available_formats()
+        if "FLAC" in supported:
+            formats.append("flac")
+        if "OGG" in supported and "OPUS" in sf.available_subtypes("OGG"):
+            formats.append("opus")
+    return formats
+
+
+def _to_int16(block):
+    if block.dtype == np.int16:
+        return block
+    if block.dtype.kind == "f":
+        return (np.clip(block, -1.0, 1.0) * 32767).astype(np.int16)
+    return (block.astype(np.int32) >> (8 * block.dtype.itemsize - 16)).astype(np.int16)
+
+
+class _WavSegment:
+    def __init__(self, path, sample_rate, channels):
+        self._file = wave.open(path, "wb")
+        self._file.setnchannels(channels)
+        self._file.setsampwidth(2)
+        self._file.setframerate(sample_rate)
+
+    def write(self, block):
+        # wave patches the RIFF/data sizes on every write, so a crash leaves a valid file
+        self._file.writeframes(_to_int16(block).tobytes())
+
+    def close(self):
+        self._file.close()
+
+
+class _SoundFileSegment:
+    def __init__(self, path, sample_rate, channels, fmt):
+        if fmt == "opus":
+            self._file = sf.SoundFile(path, "w", sample_rate, channels, format="OGG", subtype="OPUS")
+        else:
+            self._file = sf.SoundFile(path, "w", sample_rate, channels, format="FLAC", subtype="PCM_16")
+
+    def write(self, block):
+        self._file.write(block)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class StreamingAudioWriter:
+    """Writes a recording to disk in chunks from a background thread
+
+    Producers call write() with audio blocks; a bounded queue decouples
+    them from disk I/O so memory stays flat regardless of duration. Output
+    is split into segments of segment_seconds (name_001.wav, ...), each of
+    which is a complete, playable file even if the process dies mid-write.
+    """
+    EXTENSIONS = {"wav": ".wav", "flac": ".flac", "opus": ".ogg"}
+
+    def __init__(self, base_path, sample_rate, channels=1, fmt="wav",
+                 segment_seconds=600, max_queue_chunks=256, retention=None):
+        if fmt not in available_formats():
+            print(f"[AudioStreamWriter] {fmt} not available, falling back to wav")
+            fmt = "wav"
+        self.base_path = os.path.splitext(base_path)[0]
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.format = fmt
+        self.retention = retention  # Optional RetentionManager told about each finished segment
+        self.segment_frames = int(segment_seconds * sample_rate)
+        self.files = []
+        self.dropped_chunks = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_queue_chunks)
+        self._segment = None
+        self._segment_written = 0
+        self._thread = threading.Thread(target=self._run, name="AudioStreamWriter", daemon=True)
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.base_path) or ".", exist_ok=True)
+        self._thread.start()
+        return self
+
+    def write(self, chunk, copy=False):
+        """Queue a block for writing; never blocks the audio thread
+
+        The block is queued as is, so it must not be modified afterwards.
+        Pass copy=True for buffers the caller reuses, such as the indata
+        array of a sounddevice callback.
+        """
+        block = np.array(chunk, copy=True) if copy else np.asarray(chunk)
+        try:
+            self._queue.put_nowait(block.reshape(-1, self.channels))
+        except queue.Full:
+            self.dropped_chunks += 1
+
+    def close(self, timeout=None):
+        """Flush queued audio, finalize the last segment and return the written files"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        return list(self.files)
+
+    def _close_segment(self):
+        self._segment.close()
+        self._segment = None
+        if self.retention is not None:
+            self.retention.add_file(self.files[-1])
+            self.retention.enforce_later()
+
+    def _open_segment(self):
+        path = f"{self.base_path}_{len(self.files) + 1:03d}{self.EXTENSIONS[self.format]}"
+        if self.format == "wav":
+            self._segment = _WavSegment(path, self.sample_rate, self.channels)
+        else:
+            self._segment = _SoundFileSegment(path, self.sample_rate, self.channels, self.format)
+        self._segment_written = 0
+        self.files.append(path)
+        if self.retention is not None:
+            self.retention.open_file(path)
+
+    def _write_block(self, block):
+        while len(block):
+            if self._segment is None or self._segment_written >= self.segment_frames:
+                if self._segment is not None:
+                    self._close_segment()
+                self._open_segment()
+            room = self.segment_frames - self._segment_written
+            self._segment.write(block[:room])
+            self._segment_written += len(block[:room])
+            block = block[room:]
+
+    def _run(self):
+        try:
+            while True:
+                block = self._queue.get()
+                if block is _STOP:
+                    break
+                if self.error is not None:
+                    continue  # Keep draining so producers and close() never block
+                try:
+                    self._write_block(block)
+                except Exception as e:
+                    self.error = str(e)
+                    print(f"[AudioStreamWriter] Error writing {self.base_path}: {e}")
+        finally:
+            if self._segment is not None:
+                self._close_segment()
@@ -0,0 +1,281 @@
+import heapq
+import json
+import os
+import shutil
+import threading
+import time
+
+try:
+    import soundfile as sf
+except ImportError:  # Without libsndfile old recordings can only be deleted
+    sf = None
+
+RECORDING_EXTENSIONS = (".wav", ".flac", ".ogg")
+
+SIZE_LIMIT_OPTIONS = {
+    "Unlimited": 0,
+    "1 GB": 1 << 30,
+    "5 GB": 5 << 30,
+    "20 GB": 20 << 30,
+    "100 GB": 100 << 30,
+}
+
+AGE_LIMIT_OPTIONS = {
+    "Forever": 0,
+    "1 day": 86400,
+    "7 days": 7 * 86400,
+    "30 days": 30 * 86400,
+}
+
+COMPRESS_OPTIONS = {
+    "Never": None,
+    "After 1 day": 86400,
+    "After 7 days": 7 * 86400,
+}
+
+MANIFEST_NAME = ".recordings.json"  # Recordings this app wrote; nothing else is ever touched
+
+MIN_FREE_BYTES = 1 << 30  # Warn (and trim, when a quota is set) when the disk has less than this left
+MIN_FREE_FRACTION = 0.05
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def retention_limits(settings):
+    """(max_bytes, max_age_seconds, compress_after) from a category's audio_recording settings
+
+    0 means no size/age limit and None means never compress.
+    """
+    settings = settings or {}
+    return (SIZE_LIMIT_OPTIONS.get(settings.get("max_size", "Unlimited"), 0),
+            AGE_LIMIT_OPTIONS.get(settings.get("max_age", "Forever"), 0),
+            COMPRESS_OPTIONS.get(settings.get("compress", "Never")))
+
+
+def disk_warning(path):
+    """A warning message if the disk holding path is nearly full, else None"""
+    try:
+        usage = shutil.disk_usage(os.path.expanduser(path))
+    except OSError:
+        return None
+    if usage.free < MIN_FREE_BYTES or usage.free < usage.total * MIN_FREE_FRACTION:
+        return f"Low disk space: {usage.free / (1 << 30):.1f} GB free on {path}"
+    return None
+
+
+def get_retention_manager(directory):
+    """Return the shared retention manager for an output directory"""
+    directory = os.path.abspath(os.path.expanduser(directory))
+    with _managers_lock:
+        if directory not in _managers:
+            _managers[directory] = RetentionManager(directory)
+        return _managers[directory]
+
+
+class RetentionManager:
+    """Keeps the recordings this app wrote to one directory within their quotas
+
+    Only files reported through add_file() are managed; they are listed in
+    a manifest in the directory so they are still known after a restart,
+    and anything else in the tree is never compressed or deleted. enforce()
+    compresses managed WAV files older than compress_after to FLAC (opt-in,
+    needs libsndfile), then deletes the oldest managed recordings until the
+    size and age quotas hold. A nearly full disk only trims when a size or
+    age quota is set; otherwise it is just reported. enforce_later() runs
+    enforce() on the manager's own worker thread so neither the GUI nor
+    the audio writer ever waits on it.
+    """
+
+    def __init__(self, directory, max_bytes=0, max_age=0, compress_after=None):
+        self.directory = directory
+        self.manifest_file = os.path.join(directory, MANIFEST_NAME)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress_after = compress_after
+        self.total_bytes = 0
+        self.warning = None  # Last disk_warning() seen by enforce()
+        self._files = {}  # path -> (mtime, size)
+        self._oldest = []  # heap of (mtime, path); stale entries are skipped on pop
+        self._loaded = False
+        self._lock = threading.RLock()
+        # Writers only ever take this lock, so they never wait on a running enforce()
+        self._pending_lock = threading.Lock()
+        self._open = set()  # files still being written, never touched
+        self._added = []  # finished files not yet tracked
+        self._pending = False
+        self._worker = None
+
+    def set_limits(self, max_bytes=0, max_age=0, compress_after=None):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.max_age = max_age
+            self.compress_after = compress_after
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.manifest_file) as f:
+                names = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"[RetentionManager] Error reading {self.manifest_file}: {e}")
+            return
+        for name in names:
+            self._track(os.path.join(self.directory, name))
+
+    def _save(self):
+        names = sorted(os.path.relpath(path, self.directory) for path in self._files)
+        tmp_file = self.manifest_file + ".tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(names, f, indent=1)
+            os.replace(tmp_file, self.manifest_file)
+        except OSError as e:
+            print(f"[RetentionManager] Error writing {self.manifest_file}: {e}")
+
+    def _track(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        self._untrack(path)
+        self._files[path] = (stat.st_mtime, stat.st_size)
+        self.total_bytes += stat.st_size
+        heapq.heappush(self._oldest, (stat.st_mtime, path))
+        return True
+
+    def _untrack(self, path):
+        entry = self._files.pop(path, None)
+        if entry:
+            self.total_bytes -= entry[1]
+
+    def _take_added(self):
+        with self._pending_lock:
+            added, self._added = self._added, []
+        changed = False
+        for path in added:
+            changed = self._track(os.path.abspath(path)) or changed
+        return changed
+
+    def open_file(self, path):
+        """Mark a file as being written so enforce() leaves it alone"""
+        with self._pending_lock:
+            self._open.add(os.path.abspath(path))
+
+    def add_file(self, path):
+        """Take over a finished recording; cheap, tracking happens on the next enforce()"""
+        path = os.path.abspath(path)
+        with self._pending_lock:
+            self._open.discard(path)
+            self._added.append(path)
+
+    def usage(self):
+        with self._lock:
+            self._load()
+            if self._take_added():
+                self._save()
+            return self.total_bytes
+
+    def enforce_later(self):
+        """Run enforce() on the worker thread; requests made while it runs coalesce into one more pass"""
+        with self._pending_lock:
+            self._pending = True
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_pending, name="RetentionManager", daemon=True)
+                self._worker.start()
+
+    def _run_pending(self):
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                self._pending = False
+            try:
+                self.enforce()
+            except Exception as e:
+                print(f"[RetentionManager] Error enforcing {self.directory}: {e}")
+
+    def _over_quota(self):
+        if self.max_bytes and self.total_bytes > self.max_bytes:
+            return True
+        # A full disk is only a reason to delete once the user has opted into trimming
+        return bool(self.max_bytes or self.max_age) and self.warning is not None
+
+    def _compress(self, path, mtime):
+        flac_path = os.path.splitext(path)[0] + ".flac"
+        tmp_file = flac_path + ".tmp"
+        data, sample_rate = sf.read(path, dtype="int16")
+        sf.write(tmp_file, data, sample_rate, format="FLAC", subtype="PCM_16")
+        os.utime(tmp_file, (mtime, mtime))  # Keep its age so max_age still applies
+        os.replace(tmp_file, flac_path)
+        os.remove(path)
+        return flac_path
+
+    def _compress_old(self, now, is_open, actions):
+        if self.compress_after is None or sf is None:
+            return
+        cutoff = now - self.compress_after
+        candidates = sorted((mtime, path) for path, (mtime, _) in self._files.items()
+                            if mtime < cutoff and path.lower().endswith(".wav") and not is_open(path))
+        for mtime, path in candidates:
+            try:
+                flac_path = self._compress(path, mtime)
+            except Exception as e:
+                print(f"[RetentionManager] Error compressing {path}: {e}")
+                return
+            self._untrack(path)
+            self._track(flac_path)
+            actions.append(("compressed", path))
+
+    def _is_open(self, path):
+        with self._pending_lock:
+            return path in self._open
+
+    def enforce(self, now=None):
+        """Apply the quotas to managed recordings; returns a list of (action, path) taken"""
+        now = time.time() if now is None else now
+        actions = []
+        with self._lock:
+            self._load()
+            changed = self._take_added()
+            self.warning = disk_warning(self.directory)
+            self._compress_old(now, self._is_open, actions)
+            skipped = []
+            while self._oldest:
+                mtime, path = self._oldest[0]
+                if self._files.get(path, (None,))[0] != mtime:
+                    heapq.heappop(self._oldest)  # Stale entry
+                    continue
+                expired = self.max_age and now - mtime > self.max_age
+                if not expired and not self._over_quota():
+                    break
+                heapq.heappop(self._oldest)
+                if self._is_open(path):
+                    skipped.append((mtime, path))
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"[RetentionManager] Error deleting {path}: {e}")
+                    skipped.append((mtime, path))
+                    break
+                self._untrack(path)
+                actions.append(("deleted", path))
+                self.warning = disk_warning(self.directory)
+            for entry in skipped:
+                heapq.heappush(self._oldest, entry)
+            if changed or actions:
+                self._save()
+        if actions:
+            print(f"[RetentionManager] {self.directory}: {len(actions)} recordings trimmed, "
+                  f"{self.total_bytes / (1 << 20):.1f} MB in use")
+        if self.warning:
+            print(f"[RetentionManager] {self.warning}")
+        return actions
@@ -0,0 +1,124 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+import os
+import threading
+import time
+import sounddevice as sd
+from utils.audio_ring_buffer import PreRollBuffer, preroll_seconds
+from utils.audio_stream_writer import StreamingAudioWriter
+from utils.disk_retention import get_retention_manager, retention_limits
+
+
+def duration_seconds(settings):
+    """Recording length configured in a category's audio_recording settings ("5 minutes" -> 300)"""
+    value = (settings or {}).get("duration", "1 minute")
+    try:
+        return int(str(value).split()[0]) * 60
+    except (ValueError, IndexError):
+        return 60
+
+
+class TriggeredRecorder(QObject):
+    """Records a category's audio when its triggers match
+
+    arm() opens an input stream for the category; while armed, the stream
+    callback keeps the configured pre-roll in a preallocated PreRollBuffer.
+    trigger() starts a StreamingAudioWriter, hands it the pre-roll and
+    then every live block until the configured duration has passed, so
+    memory stays flat however long the recording is. Each finished segment
+    is handed to the output directory's RetentionManager, which keeps the
+    category's size/age quotas. Triggering again while recording extends
+    the current recording instead of starting a new one. The writer is
+    closed on a helper thread so the audio callback never waits on the disk.
+    """
+    recording_started = pyqtSignal(str)  # base path of the new recording
+    recording_finished = pyqtSignal(list)  # segment files written
+    recording_error = pyqtSignal(str)
+
+    def __init__(self, category, settings, sample_rate=None, channels=1, parent=None):
+        super().__init__(parent)
+        self.category = category
+        self.settings = dict(settings or {})
+        self.output_path = os.path.expanduser(self.settings.get("output_path", ""))
+        self.format = self.settings.get("format", "wav")
+        self.duration = duration_seconds(self.settings)
+        self.sample_rate = int(sample_rate or sd.query_devices(kind="input")["default_samplerate"])
+        self.channels = channels
+        self.preroll = PreRollBuffer(preroll_seconds(self.settings), self.sample_rate, channels)
+        self.retention = get_retention_manager(self.output_path)
+        self.retention.set_limits(*retention_limits(self.settings))
+        self._stream = None
+        self._writer = None
+        self._frames_left = 0
+        self._lock = threading.Lock()
+
+    def is_armed(self):
+        return self._stream is not None
+
+    def is_recording(self):
+        return self._writer is not None
+
+    def arm(self):
+        """Start listening on the input device; returns False (and reports why) if it can't be opened"""
+        if self._stream is not None:
+            return True
+        try:
+            self._stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                dtype="float32",
+                callback=self._callback,
+            )
+            self._stream.start()
+        except Exception as e:
+            self._stream = None
+            self.recording_error.emit(f"Failed to open microphone: {str(e)}")
+            return False
+        return True
+
+    def trigger(self):
+        """Start recording now, or keep the running recording going for another full duration"""
+        if self._stream is None:
+            return
+        with self._lock:
+            self._frames_left = self.duration * self.sample_rate
+            if self._writer is not None:
+                return
+            base_path = os.path.join(self.output_path, f"{self.category}_{time.strftime('%Y%m%d-%H%M%S')}")
+            self._writer = StreamingAudioWriter(base_path, self.sample_rate, self.channels, self.format,
+                                               retention=self.retention).start()
+            # Under the lock, so the pre-roll is queued before the first live block
+            self.preroll.flush(self._writer.write)
+        self.recording_started.emit(base_path)
+
+    def disarm(self):
+        """Stop listening; a recording in progress is finalized"""
+        if self._stream is not None:
+            self._stream.abort()
+            self._stream.close()
+            self._stream = None
+        with self._lock:
+            writer, self._writer = self._writer, None
+        self.preroll.clear()
+        if writer is not None:
+            self._finish(writer)
+
+    def _callback(self, indata, frames, time_info, status):
+        with self._lock:
+            writer = self._writer
+            if writer is None:
+                self.preroll.write(indata)
+                return
+            writer.write(indata, copy=True)  # indata is reused by PortAudio after we return
+            self._frames_left -= frames
+            if self._frames_left > 0:
+                return
+            self._writer = None
+        threading.Thread(target=self._finish, args=(writer,), name="TriggeredRecorderClose", daemon=True).start()
+
+    def _finish(self, writer):
+        files = writer.close()
+        if writer.error:
+            self.recording_error.emit(f"Error writing recording: {writer.error}")
+        if writer.dropped_chunks:
+            print(f"[TriggeredRecorder] {self.category}: {writer.dropped_chunks} blocks dropped (disk too slow)")
+        self.recording_finished.emit(files)